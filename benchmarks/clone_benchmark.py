@@ -0,0 +1,52 @@
+"""Cost of copying a mid-game GameBoard: deepcopy against clone and snapshot.
+
+    python benchmarks/clone_benchmark.py --plies 40
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game_board import GameBoard  # noqa: E402
+
+
+def mid_game_board(plies, seed=0):
+    rng = random.Random(seed)
+    board = GameBoard()
+    for _ in range(plies):
+        moves = board.generate_legal_moves(board.turn, mandatory_capture=True)
+        if not moves:
+            break
+        board.make_move(moves[rng.randrange(len(moves))])
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--plies', type=int, default=40)
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    board = mid_game_board(args.plies)
+    with_squares = mid_game_board(args.plies)
+    with_squares.squares
+    cases = [
+        ('deepcopy', lambda: copy.deepcopy(board)),
+        ('deepcopy, squares built', lambda: copy.deepcopy(with_squares)),
+        ('from_bytes(to_bytes())', lambda: GameBoard.from_bytes(board.to_bytes())),
+        ('clone', board.clone),
+        ('snapshot', board.snapshot),
+    ]
+    baseline = None
+    for name, function in cases:
+        seconds = min(timeit.repeat(function, number=args.number, repeat=3)) / args.number
+        baseline = baseline or seconds
+        print(f"{name:24s} {seconds * 1e6:9.2f} us  {baseline / seconds:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
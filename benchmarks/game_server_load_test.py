@@ -0,0 +1,99 @@
+"""Load test for game_server: many concurrent clients playing against the AI.
+
+Starts a server in-process unless ``--connect`` (host:port) or ``--unix`` is
+given, then runs ``--clients`` connections that each play ``--games`` games
+with random legal moves and reports request latency percentiles.
+
+    python benchmarks/game_server_load_test.py --clients 200 --games 2 --depth 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game_server import GameServer  # noqa: E402
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def client(address, games, depth, max_plies, seed, latencies):
+    rng = random.Random(seed)
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+
+    async def send(**request):
+        start = time.perf_counter()
+        writer.write(json.dumps(request).encode() + b'\n')
+        await writer.drain()
+        reply = json.loads(await reader.readline())
+        latencies[request['op']].append(time.perf_counter() - start)
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply
+
+    for _ in range(games):
+        reply = await send(op='new', ai='black', depth=depth)
+        while reply['winner'] is None and reply['plies'] < max_plies:
+            reply = await send(op='move', game=reply['game'], move=rng.choice(reply['moves']))
+        await send(op='close', game=reply['game'])
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(args):
+    server = None
+    if args.unix:
+        address = args.unix
+    elif args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        address = (host, int(port))
+    else:
+        server = GameServer(workers=args.workers)
+        listener = await server.start(port=0)
+        address = listener.sockets[0].getsockname()[:2]
+
+    latencies = {'new': [], 'move': [], 'close': []}
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*[client(address, args.games, args.depth, args.max_plies, seed, latencies)
+                               for seed in range(args.clients)])
+    finally:
+        if server is not None:
+            await server.close()
+    elapsed = time.perf_counter() - start
+
+    requests = sum(len(values) for values in latencies.values())
+    print(f"{args.clients} clients, {requests} requests in {elapsed:.2f}s ({requests / elapsed:.0f} requests/s)")
+    for op, values in latencies.items():
+        values.sort()
+        print(f"  {op:6s} n={len(values):7d}  p50 {percentile(values, 0.5) * 1000:8.2f}ms  "
+              f"p90 {percentile(values, 0.9) * 1000:8.2f}ms  p99 {percentile(values, 0.99) * 1000:8.2f}ms  "
+              f"max {(values[-1] if values else 0) * 1000:8.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--games', type=int, default=1)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--max-plies', type=int, default=60)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--connect', help="host:port of a running server")
+    parser.add_argument('--unix', help="Unix socket path of a running server")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
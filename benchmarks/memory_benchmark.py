@@ -0,0 +1,87 @@
+"""Memory held by many live boards, with and without the square/piece views.
+
+Compares the slot-based, shared-value ``Square``/``Piece`` views with a
+dict-based copy of the original object model (64 squares and 24 pieces per
+board, colors as strings).
+
+    python benchmarks/memory_benchmark.py --boards 100000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game_board import GameBoard  # noqa: E402
+
+
+class LegacySquare:
+    def __init__(self, color):
+        self.color = color
+        self.piece = None
+
+
+class LegacyPiece:
+    def __init__(self, color):
+        self.color = color
+        self.is_king = False
+
+
+class LegacyBoard:
+    def __init__(self):
+        self.squares = [[LegacySquare('white' if (i + j) % 2 == 0 else 'black') for j in range(8)] for i in range(8)]
+        for i in range(8):
+            for j in range(8):
+                if (i + j) % 2 == 1 and (i < 3 or i > 4):
+                    self.squares[i][j].piece = LegacyPiece('white' if i < 3 else 'black')
+
+
+def bare(board):
+    return board
+
+
+def with_squares(board):
+    board.squares
+    return board
+
+
+def with_pieces(board):
+    for row in board.squares:
+        for square in row:
+            square.piece
+    return board
+
+
+def measure(factory, touch, count):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    boards = [touch(factory()) for _ in range(count)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del boards
+    gc.collect()
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--boards', type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [('legacy objects', LegacyBoard, bare),
+             ('bitboards only', GameBoard, bare),
+             ('+ squares view', GameBoard, with_squares),
+             ('+ piece views', GameBoard, with_pieces)]
+    for name, factory, touch in cases:
+        size, elapsed = measure(factory, touch, args.boards)
+        print(f"{name:16s} {size / 2 ** 20:9.1f} MiB  {size / args.boards:8.0f} bytes/board  "
+              f"{elapsed:6.2f}s to build")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Per-call cost of move geometry: computed on every call vs precomputed tables.
+
+    python benchmarks/move_tables_benchmark.py
+
+The "computed" column re-implements the checks GameBoard made before the
+lookup tables existed (bounds, abs() differences, midpoint squares, a new
+neighbour list per call); the "tables" column calls the current GameBoard.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bitboard import ALL_DIRECTIONS, square_index  # noqa: E402
+from game_board import GameBoard  # noqa: E402
+from move_tables import JUMPS  # noqa: E402
+
+
+def computed_move_type(board, from_row, from_col, to_row, to_col):
+    if not (0 <= from_row < 8 and 0 <= from_col < 8 and 0 <= to_row < 8 and 0 <= to_col < 8):
+        return None
+    source = square_index(from_row, from_col)
+    target = square_index(to_row, to_col)
+    if source is None or target is None:
+        return None
+    occupied = board.white | board.black
+    if not occupied >> source & 1 or occupied >> target & 1:
+        return None
+    is_white = board.white >> source & 1
+    row_diff = to_row - from_row
+    col_diff = to_col - from_col
+    if abs(row_diff) == 1 and abs(col_diff) == 1:
+        if board.kings >> source & 1 or (is_white and row_diff > 0) or (not is_white and row_diff < 0):
+            return 'move'
+    elif abs(row_diff) == 2 and abs(col_diff) == 2:
+        middle = square_index((from_row + to_row) // 2, (from_col + to_col) // 2)
+        opponents = board.black if is_white else board.white
+        if opponents >> middle & 1:
+            return 'capture'
+    return None
+
+
+def computed_adjacent_squares(board, row, col):
+    adjacent = []
+    for i, j in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+        new_row, new_col = row + i, col + j
+        if 0 <= new_row < 8 and 0 <= new_col < 8:
+            adjacent.append(board.squares[new_row][new_col])
+    return adjacent
+
+
+def computed_jumps(board, index, opponents, occupied):
+    count = 0
+    position = 1 << index
+    for shift, _ in ALL_DIRECTIONS:
+        middle = shift(position) & opponents
+        if shift(middle) & ~occupied:
+            count += 1
+    return count
+
+
+def table_jumps(board, index, opponents, occupied):
+    count = 0
+    for middle, landing in JUMPS[index]:
+        if opponents & middle and not occupied >> landing & 1:
+            count += 1
+    return count
+
+
+def report(name, computed, tables, number):
+    before = min(timeit.repeat(computed, number=number, repeat=5)) / number * 1e9
+    after = min(timeit.repeat(tables, number=number, repeat=5)) / number * 1e9
+    print(f"{name:22s} {before:8.0f} ns  {after:8.0f} ns  {before / after:5.2f}x")
+
+
+def main(number=200_000):
+    board = GameBoard()
+    board.move_piece([(5, 0), (4, 1)])
+    board.move_piece([(4, 1), (3, 2)])
+    index = square_index(2, 1)
+    occupied = board.white | board.black
+    print(f"{'':22s} {'computed':>11s}  {'tables':>11s}")
+    report('_get_move_type', lambda: computed_move_type(board, 2, 1, 4, 3),
+           lambda: board._get_move_type(2, 1, 4, 3), number)
+    report('get_adjacent_squares', lambda: computed_adjacent_squares(board, 3, 3),
+           lambda: board.get_adjacent_squares(3, 3), number)
+    report('jump lookup', lambda: computed_jumps(board, index, board.black, occupied),
+           lambda: table_jumps(board, index, board.black, occupied), number)
+
+
+if __name__ == '__main__':
+    main()
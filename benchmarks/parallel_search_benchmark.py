@@ -0,0 +1,58 @@
+"""Speedup of ParallelSearchEngine against worker count.
+
+    python benchmarks/parallel_search_benchmark.py --depth 8 --workers 1 2 4 8 16
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game_board import GameBoard  # noqa: E402
+from parallel_search import ParallelSearchEngine  # noqa: E402
+from search import SearchEngine  # noqa: E402
+
+
+def opening_positions(count):
+    # Deterministic spread of early-game positions reached by short playouts.
+    positions = []
+    for seed in range(count):
+        board = GameBoard()
+        for ply in range(6):
+            moves = board.generate_legal_moves(board.turn, mandatory_capture=True)
+            if not moves:
+                break
+            board.make_move(moves[(seed * 7 + ply * 3) % len(moves)])
+        positions.append(board.position())
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--depth', type=int, default=7)
+    parser.add_argument('--positions', type=int, default=4)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    positions = opening_positions(args.positions)
+
+    start = time.perf_counter()
+    nodes = sum(SearchEngine(max_depth=args.depth).search(GameBoard.from_position(position)).nodes
+                for position in positions)
+    baseline = time.perf_counter() - start
+    print(f"serial      {baseline:8.2f}s  {nodes / baseline:10.0f} nodes/s")
+
+    for workers in sorted(set(args.workers)):
+        # No transposition table on either side, so the speedup only measures parallelism.
+        with ParallelSearchEngine(workers=workers, max_depth=args.depth, transposition_table_bytes=0) as engine:
+            engine.search(GameBoard(), max_depth=1)  # warm up the pool
+            start = time.perf_counter()
+            nodes = sum(engine.search(GameBoard.from_position(position)).nodes for position in positions)
+            elapsed = time.perf_counter() - start
+        print(f"{workers:2d} workers  {elapsed:8.2f}s  {nodes / elapsed:10.0f} nodes/s  "
+              f"speedup {baseline / elapsed:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
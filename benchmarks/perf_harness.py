@@ -0,0 +1,111 @@
+"""Before/after performance regression harness for the board and search hot paths.
+
+    python benchmarks/perf_harness.py --save baseline.json      # on the old tree
+    python benchmarks/perf_harness.py --compare baseline.json   # on the new tree
+
+Each benchmark reports the best of several rounds. ``--compare`` exits with
+status 1 when any benchmark is slower than the baseline by more than
+``--tolerance`` (default 10%), and perft counts are checked on every run.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from game_board import GameBoard  # noqa: E402
+from perft import PERFT_POSITIONS, parse_diagram, perft  # noqa: E402
+from search import SearchEngine  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(function):
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+@benchmark('perft_initial_5')
+def bench_perft_initial():
+    diagram, turn, expected = PERFT_POSITIONS['initial']
+    assert perft(parse_diagram(diagram, turn), 5) == expected[5]
+
+
+@benchmark('perft_capture_chains_6')
+def bench_perft_captures():
+    diagram, turn, expected = PERFT_POSITIONS['capture_chains']
+    assert perft(parse_diagram(diagram, turn), 6) == expected[6]
+
+
+@benchmark('generate_legal_moves_x10000')
+def bench_generate():
+    board = parse_diagram(*PERFT_POSITIONS['kings_endgame'][:2])
+    for _ in range(10000):
+        board.generate_legal_moves('white')
+
+
+@benchmark('move_piece_x10000')
+def bench_move_piece():
+    board = GameBoard()
+    for _ in range(5000):
+        board.move_piece([(2, 1), (3, 0)])
+        board.move_piece([(3, 0), (2, 1)])  # rejected: men cannot step back
+
+
+@benchmark('search_depth_6')
+def bench_search():
+    SearchEngine(max_depth=6).search(GameBoard())
+
+
+def run(names, rounds):
+    results = {}
+    for name in names:
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            BENCHMARKS[name]()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save', metavar='PATH')
+    parser.add_argument('--compare', metavar='PATH')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('-k', dest='names', action='append', choices=sorted(BENCHMARKS))
+    args = parser.parse_args()
+
+    results = run(args.names or list(BENCHMARKS), args.rounds)
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as stream:
+            baseline = json.load(stream)
+
+    regressions = []
+    for name, seconds in results.items():
+        line = f"{name:30s} {seconds * 1000:10.2f} ms"
+        if name in baseline:
+            change = seconds / baseline[name] - 1
+            line += f"  {change:+7.1%} vs baseline"
+            if change > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as stream:
+            json.dump(results, stream, indent=2, sort_keys=True)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}")
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+"""Packed representation of the 32 playable (black) squares of the board.
+
+Playable square ``(row, col)`` maps to bit ``row * 4 + col // 2``, so bit 0 is
+``(0, 1)`` and bit 31 is ``(7, 6)``. Rows grow towards black's side, which is
+the direction white men move in.
+"""
+
+FULL = (1 << 32) - 1
+
+ROW_MASKS = [0xF << (4 * row) for row in range(8)]
+EVEN_ROWS = ROW_MASKS[0] | ROW_MASKS[2] | ROW_MASKS[4] | ROW_MASKS[6]
+ODD_ROWS = ROW_MASKS[1] | ROW_MASKS[3] | ROW_MASKS[5] | ROW_MASKS[7]
+
+# Playable squares in the leftmost / rightmost column of each row.
+LEFT_EDGE = sum(1 << (4 * row) for row in range(1, 8, 2))
+RIGHT_EDGE = sum(1 << (4 * row + 3) for row in range(0, 8, 2))
+
+WHITE_START = ROW_MASKS[0] | ROW_MASKS[1] | ROW_MASKS[2]
+BLACK_START = ROW_MASKS[5] | ROW_MASKS[6] | ROW_MASKS[7]
+
+# Rows on which a man of the given color is promoted.
+PROMOTION_ROWS = {'white': ROW_MASKS[7], 'black': ROW_MASKS[0]}
+
+
+def square_index(row, col):
+    if not (0 <= row < 8 and 0 <= col < 8) or (row + col) % 2 == 0:
+        return None
+    return row * 4 + col // 2
+
+
+def square_coordinates(index):
+    row = index >> 2
+    return row, ((index & 3) << 1) + (0 if row & 1 else 1)
+
+
+def shift_down_left(bb):
+    # (row + 1, col - 1)
+    bb &= ~ROW_MASKS[7]
+    return (((bb & EVEN_ROWS) << 4) | ((bb & ODD_ROWS & ~LEFT_EDGE) << 3)) & FULL
+
+
+def shift_down_right(bb):
+    # (row + 1, col + 1)
+    bb &= ~ROW_MASKS[7]
+    return (((bb & EVEN_ROWS & ~RIGHT_EDGE) << 5) | ((bb & ODD_ROWS) << 4)) & FULL
+
+
+def shift_up_left(bb):
+    # (row - 1, col - 1)
+    bb &= ~ROW_MASKS[0]
+    return ((bb & EVEN_ROWS) >> 4) | ((bb & ODD_ROWS & ~LEFT_EDGE) >> 5)
+
+
+def shift_up_right(bb):
+    # (row - 1, col + 1)
+    bb &= ~ROW_MASKS[0]
+    return ((bb & EVEN_ROWS & ~RIGHT_EDGE) >> 3) | ((bb & ODD_ROWS) >> 4)
+
+
+# Each direction paired with the shift that undoes it.
+DOWN_DIRECTIONS = [(shift_down_left, shift_up_right), (shift_down_right, shift_up_left)]
+UP_DIRECTIONS = [(shift_up_left, shift_down_right), (shift_up_right, shift_down_left)]
+FORWARD_DIRECTIONS = {'white': DOWN_DIRECTIONS, 'black': UP_DIRECTIONS}
+BACKWARD_DIRECTIONS = {'white': UP_DIRECTIONS, 'black': DOWN_DIRECTIONS}
+ALL_DIRECTIONS = DOWN_DIRECTIONS + UP_DIRECTIONS
+
+
+def iter_bits(bb):
+    while bb:
+        low = bb & -bb
+        yield low.bit_length() - 1
+        bb ^= low
+
+
+def squares_from_mask(bb):
+    return [square_coordinates(index) for index in iter_bits(bb)]
+
+
+# A position packs into POSITION_BYTES: each square is one base-5 digit
+# (empty, white man, black man, white king, black king) and the lowest digit
+# is the side to move. 2 * 5**32 < 2**80.
+POSITION_BYTES = 10
+
+
+def pack_position(white, black, kings, turn):
+    value = 0
+    for index in range(31, -1, -1):
+        bit = 1 << index
+        if white & bit:
+            state = 3 if kings & bit else 1
+        elif black & bit:
+            state = 4 if kings & bit else 2
+        else:
+            state = 0
+        value = value * 5 + state
+    value = value * 2 + (turn == 'black')
+    return value.to_bytes(POSITION_BYTES, 'little')
+
+
+def unpack_position(data):
+    value = int.from_bytes(data[:POSITION_BYTES], 'little')
+    value, black_to_move = divmod(value, 2)
+    white = black = kings = 0
+    for index in range(32):
+        value, state = divmod(value, 5)
+        if state:
+            bit = 1 << index
+            if state & 1:
+                white |= bit
+            else:
+                black |= bit
+            if state > 2:
+                kings |= bit
+    if value:
+        raise ValueError("Invalid packed position")
+    return white, black, kings, 'black' if black_to_move else 'white'
@@ -0,0 +1,228 @@
+"""Static evaluation with configurable weights, one position or whole batches.
+
+The score is linear in a handful of features, counted for white minus black
+and returned from the side to move's point of view like ``search.evaluate``:
+
+- material: ``man`` and ``king`` per piece;
+- advancement: ``advancement`` per row a man has moved up the board;
+- back rank: ``back_rank`` per man still guarding its own first row;
+- center: ``center`` per piece on the four middle squares;
+- mobility: ``mobility`` per simple step a piece could make into an empty
+  square (men forward, kings both ways), whoever is to move.
+
+Everything but mobility is a piece-square table, so ``EvaluatedBoard`` can
+keep that part up to date in O(1) on ``make_move`` / ``unmake_move``. Batch
+evaluation needs NumPy (see ``tensor_export``); the rest does not. All three
+paths use integer arithmetic and agree exactly with ``Evaluator.reference``.
+"""
+from bitboard import (iter_bits, shift_down_left, shift_down_right, shift_up_left, shift_up_right,
+                      square_coordinates)
+from game_board import GameBoard
+from move_tables import KING_STEPS, MAN_STEPS, index_of
+from search import MAN_VALUE, KING_VALUE
+from tensor_export import _as_positions, _require_numpy, _square_bits
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+CENTER = frozenset(index_of(row, col) for row in (3, 4) for col in range(2, 6)) - {None}
+
+# Planes in the order used by tensor_export: white men, white kings, black men, black kings.
+WHITE_MAN, WHITE_KING, BLACK_MAN, BLACK_KING = range(4)
+
+
+class EvaluationWeights:
+    def __init__(self, man=MAN_VALUE, king=KING_VALUE, advancement=2, back_rank=8, center=4, mobility=1):
+        self.man = man
+        self.king = king
+        self.advancement = advancement
+        self.back_rank = back_rank
+        self.center = center
+        self.mobility = mobility
+
+    def __repr__(self):
+        return (f"EvaluationWeights(man={self.man}, king={self.king}, advancement={self.advancement}, "
+                f"back_rank={self.back_rank}, center={self.center}, mobility={self.mobility})")
+
+
+def _plane(board, index):
+    king = board.kings >> index & 1
+    return (WHITE_KING if king else WHITE_MAN) if board.white >> index & 1 else (BLACK_KING if king else BLACK_MAN)
+
+
+def _direction_targets():
+    # Target of a single step from each square, per direction; 32 where the step leaves the board.
+    targets = []
+    for row_step, col_step in [(1, -1), (1, 1), (-1, -1), (-1, 1)]:
+        row_targets = []
+        for index in range(32):
+            row, col = square_coordinates(index)
+            target = index_of(row + row_step, col + col_step)
+            row_targets.append(32 if target is None else target)
+        targets.append(row_targets)
+    return targets
+
+
+_DIRECTION_TARGETS = _direction_targets()
+
+
+class Evaluator:
+    """Callable evaluation for ``SearchEngine(evaluate=Evaluator(weights))``."""
+
+    def __init__(self, weights=None):
+        self.weights = weights or EvaluationWeights()
+        self.table = self._piece_square_table()
+        self._numpy_table = None
+
+    def _piece_square_table(self):
+        # table[plane * 32 + index]: contribution to white's score.
+        weights = self.weights
+        table = [0] * 128
+        for index in range(32):
+            row, _ = square_coordinates(index)
+            center = weights.center if index in CENTER else 0
+            table[WHITE_MAN * 32 + index] = (weights.man + weights.advancement * row
+                                             + (weights.back_rank if row == 0 else 0) + center)
+            table[BLACK_MAN * 32 + index] = -(weights.man + weights.advancement * (7 - row)
+                                              + (weights.back_rank if row == 7 else 0) + center)
+            table[WHITE_KING * 32 + index] = weights.king + center
+            table[BLACK_KING * 32 + index] = -(weights.king + center)
+        return table
+
+    def reference(self, board):
+        """Straightforward per-piece evaluation that the fast paths must match."""
+        weights = self.weights
+        empty = board.empty_squares()
+        score = 0
+        for index in iter_bits(board.white | board.black):
+            row, _ = square_coordinates(index)
+            color = 'white' if board.white >> index & 1 else 'black'
+            sign = 1 if color == 'white' else -1
+            if board.kings >> index & 1:
+                value = weights.king
+                steps = KING_STEPS[index]
+            else:
+                advanced = row if color == 'white' else 7 - row
+                value = weights.man + weights.advancement * advanced
+                if advanced == 0:
+                    value += weights.back_rank
+                steps = MAN_STEPS[color][index]
+            if index in CENTER:
+                value += weights.center
+            value += weights.mobility * sum(1 for target in steps if empty >> target & 1)
+            score += sign * value
+        return score if board.turn == 'white' else -score
+
+    def material(self, board):
+        """Piece-square part of the score from white's point of view."""
+        table = self.table
+        score = 0
+        for index in iter_bits(board.white | board.black):
+            score += table[_plane(board, index) * 32 + index]
+        return score
+
+    def mobility(self, board):
+        """Simple steps into empty squares, white's minus black's."""
+        empty = board.empty_squares()
+        white_kings = board.white & board.kings
+        black_kings = board.black & board.kings
+        count = 0
+        for shift in (shift_down_left, shift_down_right):
+            count += (shift(board.white) & empty).bit_count() - (shift(black_kings) & empty).bit_count()
+        for shift in (shift_up_left, shift_up_right):
+            count += (shift(white_kings) & empty).bit_count() - (shift(board.black) & empty).bit_count()
+        return count
+
+    def __call__(self, board):
+        # Only a board kept up to date with this evaluator's table can skip the piece scan.
+        if isinstance(board, EvaluatedBoard) and board.evaluator is self:
+            material = board.material
+        else:
+            material = self.material(board)
+        score = material + self.weights.mobility * self.mobility(board)
+        return score if board.turn == 'white' else -score
+
+    def evaluate_batch(self, positions):
+        """Scores of boards, an ``(N, 4)`` position array or a packed buffer as an ``int64`` array."""
+        _require_numpy()
+        positions = _as_positions(positions)
+        if self._numpy_table is None:
+            self._numpy_table = np.array(self.table, dtype=np.int64).reshape(4, 32)
+        white, black, kings, turn = (positions[:, i] for i in range(4))
+        planes = np.stack([white & ~kings, white & kings, black & ~kings, black & kings], axis=1)
+        bits = _square_bits(planes.reshape(-1)).reshape(len(positions), 4, 32).astype(np.int64)
+        score = np.einsum('npi,pi->n', bits, self._numpy_table)
+
+        empty = np.ones((len(positions), 33), dtype=np.int64)
+        empty[:, :32] -= bits.sum(axis=1)
+        empty[:, 32] = 0  # steps off the board
+        down_left, down_right, up_left, up_right = (empty[:, targets] for targets in _DIRECTION_TARGETS)
+        white_steps = bits[:, WHITE_MAN] + bits[:, WHITE_KING]
+        black_steps = bits[:, BLACK_MAN] + bits[:, BLACK_KING]
+        mobility = ((white_steps * (down_left + down_right)).sum(axis=1)
+                    + (bits[:, WHITE_KING] * (up_left + up_right)).sum(axis=1)
+                    - (black_steps * (up_left + up_right)).sum(axis=1)
+                    - (bits[:, BLACK_KING] * (down_left + down_right)).sum(axis=1))
+        score += self.weights.mobility * mobility
+        return np.where(turn == 1, -score, score)
+
+
+class EvaluatedBoard(GameBoard):
+    """``GameBoard`` that keeps ``material`` (white's piece-square score) current.
+
+    ``make_move`` and ``move_piece`` apply a delta for the pieces that moved,
+    were captured or crowned and ``unmake_move`` restores the saved value;
+    the rarely used editing paths recompute it from scratch.
+    """
+
+    def __init__(self, evaluator=None):
+        self.evaluator = evaluator or Evaluator()
+        self.material = 0
+        self._material_stack = []
+        super().__init__()
+
+    def _copy_state(self):
+        board = super()._copy_state()
+        board.evaluator = self.evaluator
+        board.material = self.material
+        board._material_stack = self._material_stack.copy()
+        return board
+
+    def _recompute(self):
+        self.material = self.evaluator.material(self)
+
+    def _setup_initial_pieces(self):
+        super()._setup_initial_pieces()
+        self._recompute()
+
+    def set_position(self, white, black, kings=0, turn='white'):
+        super().set_position(white, black, kings, turn)
+        self._material_stack = []
+        self._recompute()
+
+    def _place(self, index, piece):
+        super()._place(index, piece)
+        self._recompute()
+
+    def _set_king(self, index, value):
+        super()._set_king(index, value)
+        self._recompute()
+
+    def _apply(self, source, target, captured, color, crowned):
+        table = self.evaluator.table
+        delta = -table[_plane(self, source) * 32 + source]
+        for index in iter_bits(captured):
+            delta -= table[_plane(self, index) * 32 + index]
+        super()._apply(source, target, captured, color, crowned)
+        self.material += delta + table[_plane(self, target) * 32 + target]
+
+    def make_move(self, move):
+        self._material_stack.append(self.material)
+        super().make_move(move)
+
+    def unmake_move(self):
+        move = super().unmake_move()
+        self.material = self._material_stack.pop()
+        return move
@@ -1,152 +1,551 @@
+from enum import Enum
+
+from bitboard import (FULL, WHITE_START, BLACK_START, PROMOTION_ROWS, FORWARD_DIRECTIONS, BACKWARD_DIRECTIONS,
+                      ALL_DIRECTIONS, iter_bits, pack_position, unpack_position)
+from move import Move
+from move_tables import (ADJACENT_COORDINATES, FORWARD_ROW_DIRECTION, JUMP_MIDDLE, JUMPS, SQUARE_INDEX,
+                         STEP_ROW_DIRECTION, index_of)
+from zobrist import BLACK_TO_MOVE, compute_hash, mask_hash, piece_key
+
+
+class Color(str, Enum):
+    """Interned piece and square colors; members compare equal to ``'white'`` and ``'black'``."""
+
+    WHITE = 'white'
+    BLACK = 'black'
+
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+
+_COLORS = {'white': Color.WHITE, 'black': Color.BLACK}
+
+
 class Square:
+    __slots__ = ('color', '_piece', '_board', '_index', '_view')
+
     def __init__(self, color):
-        self.color = color
-        self.piece = None
+        self.color = _COLORS.get(color, color)
+        self._piece = None
+        self._board = None
+        self._index = None
+        self._view = None
+
+    @property
+    def piece(self):
+        if self._board is None:
+            return self._piece
+        board = self._board
+        if not (board.white | board.black) >> self._index & 1:
+            return None
+        # One view per square, reused for every piece that stands on it.
+        if self._view is None:
+            self._view = Piece(None)
+            self._view._board = board
+            self._view._index = self._index
+        return self._view
+
+    @piece.setter
+    def piece(self, piece):
+        if self._board is None:
+            self._piece = piece
+        else:
+            self._board._place(self._index, piece)
+
+
+class _LightSquare(Square):
+    # Light squares never hold a piece, so every board shares a single one.
+    __slots__ = ()
+
+    @property
+    def piece(self):
+        return None
+
+    @piece.setter
+    def piece(self, piece):
+        if piece is not None:
+            raise ValueError("Pieces can only be placed on black squares")
+
+
+LIGHT_SQUARE = _LightSquare('white')
 
 
 class Piece:
-    def __init__(self, color):
-        self.color = color
-        self.is_king = False
+    """A piece, either free-standing or bound to a square of a board.
+
+    A bound piece reads its color and crown from the board masks, and setting
+    ``is_king`` crowns or uncrowns the piece on the board.
+    """
+
+    __slots__ = ('_color', '_is_king', '_board', '_index')
+
+    def __init__(self, color, is_king=False):
+        self._color = _COLORS.get(color, color)
+        self._is_king = is_king
+        self._board = None
+        self._index = None
+
+    @property
+    def color(self):
+        if self._board is not None:
+            if self._board.white >> self._index & 1:
+                return Color.WHITE
+            if self._board.black >> self._index & 1:
+                return Color.BLACK
+        return self._color
+
+    @property
+    def is_king(self):
+        if self._board is None:
+            return self._is_king
+        return bool(self._board.kings >> self._index & 1)
+
+    @is_king.setter
+    def is_king(self, value):
+        if self._board is None:
+            self._is_king = value
+        else:
+            self._board._set_king(self._index, value)
+
+    def __repr__(self):
+        return f"Piece({str(self.color)!r}, is_king={self.is_king})"
+
+
+class _PieceValue(Piece):
+    # Immutable flyweight returned by ``GameBoard.get_piece``.
+    __slots__ = ()
+
+    @property
+    def is_king(self):
+        return self._is_king
+
+    @is_king.setter
+    def is_king(self, value):
+        raise AttributeError("Piece values are shared; crown the piece through board.squares instead")
+
+
+# PIECE_VALUES[plane]: white man, white king, black man, black king.
+PIECE_VALUES = (_PieceValue('white'), _PieceValue('white', True), _PieceValue('black'), _PieceValue('black', True))
 
 
 class GameBoard:
+    """Checkers board stored as three 32-bit masks over the playable squares.
+
+    ``white`` and ``black`` hold every piece of that color and ``kings`` flags
+    which of them are crowned. ``squares`` is built lazily as a view: its
+    ``Square`` and ``Piece`` objects read and write those masks directly,
+    while ``get_piece`` returns one of the four shared ``PIECE_VALUES``.
+    ``hash`` is the Zobrist key of the position and side to move; every
+    mutator keeps it up to date, so assign the masks through ``set_position``.
+    """
+
+    __slots__ = ('white', 'black', 'kings', 'hash', '_turn', '_undo_stack', '_shared_history', '_squares',
+                 '_adjacent', '__weakref__')
+
     def __init__(self):
-        self.squares = [[Square('white' if (i + j) % 2 == 0 else 'black')
-                         for j in range(8)] for i in range(8)]
+        self.white = 0
+        self.black = 0
+        self.kings = 0
+        self.hash = 0
+        self._turn = 'white'
+        self._undo_stack = []
+        self._shared_history = False
+        self._squares = None
+        self._adjacent = None
         self._setup_initial_pieces()
 
+    @property
+    def turn(self):
+        return self._turn
+
+    @turn.setter
+    def turn(self, color):
+        if color != self._turn:
+            self.hash ^= BLACK_TO_MOVE
+            self._turn = color
+
+    @classmethod
+    def from_position(cls, position):
+        board = cls()
+        board.set_position(*position)
+        return board
+
+    def position(self):
+        """Compact, picklable ``(white, black, kings, turn)`` tuple for ``from_position``."""
+        return self.white, self.black, self.kings, self._turn
+
+    @classmethod
+    def from_bytes(cls, data):
+        return cls.from_position(unpack_position(data))
+
+    def to_bytes(self):
+        """Pack the position and side to move into ``bitboard.POSITION_BYTES`` bytes."""
+        return pack_position(self.white, self.black, self.kings, self._turn)
+
+    def set_position(self, white, black, kings=0, turn='white'):
+        self.white = white
+        self.black = black
+        self.kings = kings
+        self._turn = turn
+        self.hash = compute_hash(white, black, kings, turn)
+        self._undo_stack = []
+        self._shared_history = False
+
+    def clone(self):
+        """Independent copy of the position, side to move and move history."""
+        board = self._copy_state()
+        board._undo_stack = self._undo_stack.copy()
+        return board
+
+    def snapshot(self):
+        """Copy that shares the move history with this board.
+
+        The position itself is a few integers and is copied outright; the
+        history is only copied by whichever board next plays or takes back a
+        move with ``make_move`` / ``unmake_move``.
+        """
+        board = self._copy_state()
+        board._undo_stack = self._undo_stack
+        board._shared_history = self._shared_history = True
+        return board
+
+    def _copy_state(self):
+        board = self.__class__.__new__(self.__class__)
+        board.white = self.white
+        board.black = self.black
+        board.kings = self.kings
+        board.hash = self.hash
+        board._turn = self._turn
+        board._shared_history = False
+        board._squares = None
+        board._adjacent = None
+        return board
+
+    def _own_history(self):
+        self._undo_stack = self._undo_stack.copy()
+        self._shared_history = False
+
+    @property
+    def squares(self):
+        if self._squares is None:
+            self._squares = [[self._make_square(i, j) for j in range(8)] for i in range(8)]
+        return self._squares
+
+    def _make_square(self, row, col):
+        index = index_of(row, col)
+        if index is None:
+            return LIGHT_SQUARE
+        square = Square('black')
+        square._board = self
+        square._index = index
+        return square
+
+    def _piece_at(self, index):
+        if index is None:
+            return None
+        king = self.kings >> index & 1
+        if self.white >> index & 1:
+            return PIECE_VALUES[1 if king else 0]
+        if self.black >> index & 1:
+            return PIECE_VALUES[3 if king else 2]
+        return None
+
+    def _place(self, index, piece):
+        if index is None:
+            if piece is not None:
+                raise ValueError("Pieces can only be placed on black squares")
+            return
+        # Read the piece before the square is cleared: it may be a view of this very square.
+        color = piece.color if piece is not None else None
+        if piece is not None and color not in _COLORS:
+            raise ValueError(f"Unknown piece color: {color!r}")
+        is_king = piece is not None and piece.is_king
+        bit = 1 << index
+        if (self.white | self.black) & bit:
+            self.hash ^= piece_key(self.white, self.kings, index)
+        self.white &= ~bit
+        self.black &= ~bit
+        self.kings &= ~bit
+        if piece is None:
+            return
+        if color == 'white':
+            self.white |= bit
+        else:
+            self.black |= bit
+        if is_king:
+            self.kings |= bit
+        self.hash ^= piece_key(self.white, self.kings, index)
+        # Free-standing pieces become bound to their square; values and views stay as they are.
+        if piece._board is None and not isinstance(piece, _PieceValue):
+            piece._board = self
+            piece._index = index
+
+    def _set_king(self, index, value):
+        bit = 1 << index
+        if not (self.white | self.black) & bit:
+            return
+        self.hash ^= piece_key(self.white, self.kings, index)
+        if value:
+            self.kings |= bit
+        else:
+            self.kings &= ~bit
+        self.hash ^= piece_key(self.white, self.kings, index)
+
+    def _pieces(self, color):
+        return self.white if color == 'white' else self.black
+
     def get_adjacent_squares(self, row, col):
-        adjacent = []
-        for i, j in [(-1, 0), (1, 0), (0, -1), (0, 1)]:  # Up, Down, Left, Right
-            new_row, new_col = row + i, col + j
-            if 0 <= new_row < 8 and 0 <= new_col < 8:
-                adjacent.append(self.squares[new_row][new_col])
-        return adjacent
+        # Up, Down, Left, Right; the tuples are built once per board.
+        if self._adjacent is None:
+            squares = self.squares
+            self._adjacent = [tuple(squares[i][j] for i, j in coordinates) for coordinates in ADJACENT_COORDINATES]
+        return self._adjacent[row * 8 + col]
 
     def _setup_initial_pieces(self):
-        for i in range(8):
-            for j in range(8):
-                if self.squares[i][j].color == 'black':
-                    if i < 3:
-                        self.squares[i][j].piece = Piece('white')
-                    elif i > 4:
-                        self.squares[i][j].piece = Piece('black')
+        self.white = WHITE_START
+        self.black = BLACK_START
+        self.kings = 0
+        self.hash = compute_hash(self.white, self.black, self.kings, self._turn)
 
     def get_piece(self, row, col):
-        return self.squares[row][col].piece
+        return self._piece_at(index_of(row, col))
 
     def display(self):
-        board_str = "  0 1 2 3 4 5 6 7\n"
-        for i, row in enumerate(self.squares):
-            board_str += f"{i} "
-            for square in row:
-                if square.piece is None:
-                    board_str += '.' if square.color == 'black' else ' '
+        lines = ["  0 1 2 3 4 5 6 7\n"]
+        for i in range(8):
+            cells = [f"{i} "]
+            for j in range(8):
+                index = SQUARE_INDEX[i * 8 + j]
+                if index is None:
+                    cells.append('  ')
+                    continue
+                if self.white >> index & 1:
+                    symbol = 'o'
+                elif self.black >> index & 1:
+                    symbol = 'x'
                 else:
-                    if square.piece.color == 'white':
-                        if square.piece.is_king:
-                            board_str += 'O'
-                        else:
-                            board_str += 'o'
-                    else:
-                        if square.piece.is_king:
-                            board_str += 'X'
-                        else:
-                            board_str += 'x'
-                board_str += ' '
-            board_str += '\n'
-        return board_str
+                    symbol = '.'
+                if self.kings >> index & 1:
+                    symbol = symbol.upper()
+                cells.append(symbol + ' ')
+            cells.append('\n')
+            lines.append(''.join(cells))
+        return ''.join(lines)
+
+    # Bulk queries: each returns a mask of playable squares (see bitboard.squares_from_mask).
+
+    def empty_squares(self):
+        return ~(self.white | self.black) & FULL
+
+    def movable_men(self, color):
+        men = self._pieces(color) & ~self.kings
+        empty = self.empty_squares()
+        movable = 0
+        for _, back in FORWARD_DIRECTIONS[color]:
+            movable |= back(empty)
+        return movable & men
+
+    def movable_kings(self, color):
+        kings = self._pieces(color) & self.kings
+        empty = self.empty_squares()
+        movable = 0
+        for _, back in ALL_DIRECTIONS:
+            movable |= back(empty)
+        return movable & kings
+
+    def capturing_pieces(self, color):
+        own = self._pieces(color)
+        opponents = self.black if color == 'white' else self.white
+        empty = self.empty_squares()
+        capturing = 0
+        for _, back in ALL_DIRECTIONS:
+            capturing |= back(opponents & back(empty))
+        return capturing & own
+
+    def generate_legal_moves(self, color, mandatory_capture=False):
+        """Return every legal move for ``color`` without touching the board.
+
+        Captures are complete jump chains: a chain only stops once the piece has
+        no further capture. With ``mandatory_capture`` simple moves are dropped
+        whenever a capture exists.
+        """
+        captures = self._generate_captures(color)
+        if captures and mandatory_capture:
+            return captures
+        return captures + self._generate_simple_moves(color)
+
+    def _generate_simple_moves(self, color):
+        own = self._pieces(color)
+        kings = own & self.kings
+        empty = self.empty_squares()
+        moves = []
+        for movers, directions in ((own, FORWARD_DIRECTIONS[color]), (kings, BACKWARD_DIRECTIONS[color])):
+            for shift, back in directions:
+                for target in iter_bits(shift(movers) & empty):
+                    source = back(1 << target).bit_length() - 1
+                    moves.append(Move((source, target)))
+        return moves
+
+    def _generate_captures(self, color):
+        own = self._pieces(color)
+        opponents = self.black if color == 'white' else self.white
+        moves = []
+        for source in iter_bits(self.capturing_pieces(color)):
+            occupied = (own | opponents) & ~(1 << source)
+            self._extend_jumps([source], source, 0, opponents, occupied, moves)
+        return moves
+
+    def _extend_jumps(self, path, position, captured, opponents, occupied, moves):
+        extended = False
+        for middle, landing in JUMPS[position]:
+            if opponents & middle and not captured & middle and not occupied >> landing & 1:
+                extended = True
+                path.append(landing)
+                self._extend_jumps(path, landing, captured | middle, opponents, occupied, moves)
+                path.pop()
+        if not extended and len(path) > 1:
+            moves.append(Move(tuple(path), captured))
 
     def _get_move_type(self, from_row, from_col, to_row, to_col):
-        if not (0 <= from_row < 8 and 0 <= from_col < 8 and 0 <= to_row < 8 and 0 <= to_col < 8):
+        source = index_of(from_row, from_col)
+        target = index_of(to_row, to_col)
+        if source is None or target is None:
             return None
 
-        piece = self.squares[from_row][from_col].piece
-        if piece is None or self.squares[to_row][to_col].piece is not None:
+        occupied = self.white | self.black
+        if not occupied >> source & 1 or occupied >> target & 1:
             return None
+        is_white = self.white >> source & 1
 
-        row_diff = to_row - from_row
-        col_diff = to_col - from_col
-
-        if abs(row_diff) == 1 and abs(col_diff) == 1:
-            if piece.is_king or (piece.color == 'white' and row_diff > 0) or (piece.color == 'black' and row_diff < 0):
+        pair = source * 32 + target
+        direction = STEP_ROW_DIRECTION[pair]
+        if direction:
+            if self.kings >> source & 1 or direction == (1 if is_white else -1):
                 return 'move'
-        elif abs(row_diff) == 2 and abs(col_diff) == 2:
-            mid_row, mid_col = (from_row + to_row) // 2, (from_col + to_col) // 2
-            if self.squares[mid_row][mid_col].piece and self.squares[mid_row][mid_col].piece.color != piece.color:
+        elif JUMP_MIDDLE[pair] >= 0:
+            opponents = self.black if is_white else self.white
+            if opponents >> JUMP_MIDDLE[pair] & 1:
                 return 'capture'
 
         return None
 
     def reset_moves(self, moves, piece, n_moves):
-        self.squares[moves[0][0]][moves[0][1]].piece = piece
+        self._place(index_of(*moves[0]), piece)
         for i in range(1, n_moves):
-            self.squares[moves[i][0]][moves[i][1]].piece = None
+            self._place(index_of(*moves[i]), None)
 
     def move_piece(self, moves):
         if not moves or len(moves) < 2:
             return False
 
-        from_row, from_col = moves[0]
-        piece = self.squares[from_row][from_col].piece
-        if piece is None:
+        source = index_of(*moves[0])
+        if source is None or not (self.white | self.black) >> source & 1:
             return False
 
-        captured_pieces = []
-        for i in range(1, len(moves)):
-            from_row, from_col = moves[i - 1]
-            to_row, to_col = moves[i]
+        color = 'white' if self.white >> source & 1 else 'black'
+        opponents = self.black if color == 'white' else self.white
+        is_king = self.kings >> source & 1
+        # The moving piece leaves its starting square; captured pieces stay on the
+        # board until the whole sequence has been validated.
+        occupied = (self.white | self.black) & ~(1 << source)
 
-            move_type = self._get_move_type(from_row, from_col, to_row, to_col)
-            if move_type is None:
-                self.reset_moves(moves, piece, i)
-                return False
-
-            if i > 1 and move_type != 'capture':
-                self.reset_moves(moves, piece, i)
+        captured = 0
+        target = source
+        for i in range(1, len(moves)):
+            previous, target = target, index_of(*moves[i])
+            if target is None or occupied >> target & 1:
                 return False
 
-            if move_type == 'capture':
-                mid_row, mid_col = (from_row + to_row) // 2, (from_col + to_col) // 2
-                captured_piece = self.squares[mid_row][mid_col].piece
-                if captured_piece is None or captured_piece.color == piece.color:
-                    self.reset_moves(moves, piece, i)
+            pair = previous * 32 + target
+            direction = STEP_ROW_DIRECTION[pair]
+            if direction:
+                # A simple move can only be the whole sequence.
+                if len(moves) > 2:
                     return False
-                captured_pieces.append((mid_row, mid_col))
-                self.squares[to_row][to_col].piece = piece
-                self.squares[from_row][from_col].piece = None
+                if not (is_king or direction == FORWARD_ROW_DIRECTION[color]):
+                    return False
+            else:
+                middle = JUMP_MIDDLE[pair]
+                if middle < 0 or not opponents >> middle & 1 or captured >> middle & 1:
+                    return False
+                captured |= 1 << middle
 
         # If we've made it here, the move sequence is valid. Let's execute it.
-        for from_row, from_col in captured_pieces:
-            self.squares[from_row][from_col].piece = None
+        # Check if the piece should become a king
+        crowned = is_king or PROMOTION_ROWS[color] & (1 << target)
+        self._apply(source, target, captured, color, crowned)
+        return True
 
-        final_row, final_col = moves[-1]
-        self.squares[final_row][final_col].piece = piece
-        self.squares[moves[0][0]][moves[0][1]].piece = None
+    def _apply(self, source, target, captured, color, crowned):
+        source_bit = 1 << source
+        target_bit = 1 << target
+        key = self.hash ^ piece_key(self.white, self.kings, source) ^ mask_hash(self.white, self.kings, captured)
+        if color == 'white':
+            self.white = self.white & ~source_bit | target_bit
+            self.black &= ~captured
+        else:
+            self.black = self.black & ~source_bit | target_bit
+            self.white &= ~captured
+        self.kings &= ~(captured | source_bit)
+        if crowned:
+            self.kings |= target_bit
+        self.hash = key ^ piece_key(self.white, self.kings, target)
+        self.turn = 'black' if color == 'white' else 'white'
 
-        # Check if the piece should become a king
-        if (piece.color == 'white' and final_row == 7) or (piece.color == 'black' and final_row == 0):
-            piece.is_king = True
+    def make_move(self, move):
+        """Play a generated ``Move`` and remember how to take it back.
 
-        return True
+        Only the captured kings and the promotion flag are pushed on the undo
+        stack; everything else is recovered from the move itself.
+        """
+        source_bit = 1 << move.source
+        color = 'white' if self.white & source_bit else 'black'
+        is_king = self.kings & source_bit
+        promoted = not is_king and bool(PROMOTION_ROWS[color] & (1 << move.target))
 
-    def _is_valid_move(self, from_row, from_col, to_row, to_col):
-        # Check if the move is within the board
-        if not (0 <= from_row < 8 and 0 <= from_col < 8 and 0 <= to_row < 8 and 0 <= to_col < 8):
-            return False
+        if self._shared_history:
+            self._own_history()
+        self._undo_stack.append((move, self.kings & move.captured, promoted))
+        self._apply(move.source, move.target, move.captured, color, is_king or promoted)
 
-        # Check if there's a piece at the starting position
-        piece = self.squares[from_row][from_col].piece
-        if piece is None:
+    def unmake_move(self):
+        if self._shared_history:
+            self._own_history()
+        move, captured_kings, promoted = self._undo_stack.pop()
+        source_bit = 1 << move.source
+        target_bit = 1 << move.target
+        key = self.hash ^ piece_key(self.white, self.kings, move.target)
+        was_king = self.kings & target_bit and not promoted
+        color = 'white' if self.white & target_bit else 'black'
+        if color == 'white':
+            self.white = self.white & ~target_bit | source_bit
+            self.black |= move.captured
+        else:
+            self.black = self.black & ~target_bit | source_bit
+            self.white |= move.captured
+        self.kings = self.kings & ~target_bit | captured_kings
+        if was_king:
+            self.kings |= source_bit
+        self.hash = (key ^ piece_key(self.white, self.kings, move.source)
+                     ^ mask_hash(self.white, self.kings, move.captured))
+        self.turn = color
+        return move
+
+    def _is_valid_move(self, from_row, from_col, to_row, to_col):
+        # Check if both squares are on the board and playable
+        source = index_of(from_row, from_col)
+        target = index_of(to_row, to_col)
+        if source is None or target is None:
             return False
 
-        # Check if the destination is empty
-        if self.squares[to_row][to_col].piece is not None:
+        # Check if there's a piece at the starting position and the destination is empty
+        occupied = self.white | self.black
+        if not occupied >> source & 1 or occupied >> target & 1:
             return False
 
         # Check if the move is diagonal and forward
-        if piece.color == 'white':
-            return to_row == from_row + 1 and abs(to_col - from_col) == 1
+        direction = STEP_ROW_DIRECTION[source * 32 + target]
+        if self.white >> source & 1:
+            return direction == 1
         else:  # black piece
-            return to_row == from_row - 1 and abs(to_col - from_col) == 1
+            return direction == -1
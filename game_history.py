@@ -0,0 +1,149 @@
+"""Move history around ``GameBoard.move_piece`` with replay and draw detection.
+
+Moves are kept as their square-index paths in one ``bytearray`` with an
+offset per ply, next to the position hash and the count of quiet plies
+(no capture, no man move) after every ply. A hash-indexed counter tracks
+how often each position of the current line has occurred, so repetitions
+are known in O(1) per move.
+
+The position is saved every ``checkpoint_interval`` plies; ``goto`` restores
+the nearest checkpoint (or keeps the current position when it is closer)
+and replays only the moves in between.
+"""
+from array import array
+
+from game_board import GameBoard
+from game_record import GameRecord
+from move import Move
+from move_tables import index_of
+
+
+class GameHistory:
+    """Record the moves played on ``board`` and answer draw questions.
+
+    The game is drawn when the current position has occurred ``repetitions``
+    times, or after ``draw_plies`` plies without a capture or a man move
+    (40 moves each by default, the same progress rule as ``self_play``).
+    Playing a move after going back discards the moves that followed.
+    """
+
+    def __init__(self, board=None, checkpoint_interval=16, draw_plies=80, repetitions=3):
+        self.board = board if board is not None else GameBoard()
+        self.checkpoint_interval = checkpoint_interval
+        self.draw_plies = draw_plies
+        self.repetition_limit = repetitions
+        self.ply = 0
+        self._paths = bytearray()
+        self._offsets = array('I', [0])
+        self._hashes = array('Q', [self.board.hash])
+        self._quiet = array('H', [0])
+        self._checkpoints = [self.board.position()]
+        self._counts = {self.board.hash: 1}
+
+    def __len__(self):
+        """Number of plies recorded, which can exceed ``ply`` after going back."""
+        return len(self._offsets) - 1
+
+    # Recording.
+
+    def move_piece(self, moves):
+        """``GameBoard.move_piece`` that records the move when it succeeds."""
+        board = self.board
+        source = index_of(*moves[0]) if moves else None
+        if source is None:
+            return False
+        is_man = not board.kings >> source & 1
+        pieces = (board.white | board.black).bit_count()
+        if not board.move_piece(moves):
+            return False
+
+        if self.ply < len(self):
+            self._truncate()
+        quiet = 0 if is_man or (board.white | board.black).bit_count() < pieces else self._quiet[-1] + 1
+        self._paths.extend(index_of(row, col) for row, col in moves)
+        self._offsets.append(len(self._paths))
+        self._hashes.append(board.hash)
+        self._quiet.append(min(quiet, 0xFFFF))
+        self.ply += 1
+        self._counts[board.hash] = self._counts.get(board.hash, 0) + 1
+        if self.ply % self.checkpoint_interval == 0:
+            self._checkpoints.append(board.position())
+        return True
+
+    def play(self, move):
+        """Record a generated ``Move``."""
+        return self.move_piece(move.to_coordinates())
+
+    def _truncate(self):
+        # Positions after ``ply`` are not counted any more, only their records remain.
+        del self._paths[self._offsets[self.ply]:]
+        del self._offsets[self.ply + 1:]
+        del self._hashes[self.ply + 1:]
+        del self._quiet[self.ply + 1:]
+        del self._checkpoints[self.ply // self.checkpoint_interval + 1:]
+
+    def move(self, ply):
+        """The move played at ``ply`` (0 for the first move)."""
+        return Move.from_path(tuple(self._paths[self._offsets[ply]:self._offsets[ply + 1]]))
+
+    def moves(self):
+        return [self.move(ply) for ply in range(self.ply)]
+
+    # Draw detection.
+
+    def repetitions(self):
+        """How many times the current position has occurred in the current line."""
+        return self._counts[self._hashes[self.ply]]
+
+    @property
+    def quiet_plies(self):
+        return self._quiet[self.ply]
+
+    def draw_reason(self):
+        if self.repetitions() >= self.repetition_limit:
+            return 'repetition'
+        if self.quiet_plies >= self.draw_plies:
+            return 'no progress'
+        return None
+
+    def is_draw(self):
+        return self.draw_reason() is not None
+
+    # Navigation.
+
+    def goto(self, ply):
+        """Put the board back at ``ply`` (0 for the start), replaying from the nearest checkpoint."""
+        if not 0 <= ply <= len(self):
+            raise IndexError(f"Ply {ply} is outside 0..{len(self)}")
+        counts, hashes = self._counts, self._hashes
+        for index in range(ply + 1, self.ply + 1):
+            counts[hashes[index]] -= 1
+        for index in range(self.ply + 1, ply + 1):
+            counts[hashes[index]] = counts.get(hashes[index], 0) + 1
+
+        checkpoint = ply // self.checkpoint_interval * self.checkpoint_interval
+        if not checkpoint <= self.ply <= ply:
+            self.board.set_position(*self._checkpoints[ply // self.checkpoint_interval])
+            self.ply = checkpoint
+        while self.ply < ply:
+            self.board.move_piece(self.move(self.ply).to_coordinates())
+            self.ply += 1
+
+    def undo(self):
+        self.goto(self.ply - 1)
+
+    def redo(self):
+        self.goto(self.ply + 1)
+
+    # Game records.
+
+    def to_record(self, result=None):
+        return GameRecord(self.moves(), result, self._checkpoints[0])
+
+    @classmethod
+    def from_record(cls, record, **kwargs):
+        history = cls(GameBoard.from_position(record.start), **kwargs)
+        for move in record.moves:
+            if not history.play(move):
+                raise ValueError(f"Illegal move in record at ply {history.ply}: {move!r}")
+        return history
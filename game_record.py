@@ -0,0 +1,173 @@
+"""Append-only binary files of game records.
+
+A file starts with an 8-byte header (``CKGR``, format version, padding)
+followed by length-prefixed records::
+
+    uint32 payload length
+    uint8  result (0 draw, 1 white won, 2 black won, 3 unknown)
+    bytes  start position (bitboard.POSITION_BYTES)
+    uint16 move count
+    moves  each as uint8 path length followed by one byte per square index
+
+Records can be streamed with ``iter_game_records`` or read at random through
+the memory-mapped ``GameRecordReader``.
+"""
+import mmap
+import os
+import struct
+from array import array
+
+from bitboard import POSITION_BYTES, WHITE_START, BLACK_START, pack_position, unpack_position
+from move import Move
+
+MAGIC = b'CKGR'
+VERSION = 1
+HEADER = MAGIC + bytes([VERSION, 0, 0, 0])
+
+RESULTS = ['draw', 'white', 'black', None]
+INITIAL_POSITION = (WHITE_START, BLACK_START, 0, 'white')
+
+_length = struct.Struct('<I')
+_record_head = struct.Struct(f'<B{POSITION_BYTES}sH')
+
+
+class GameRecord:
+    def __init__(self, moves, result=None, start=INITIAL_POSITION):
+        self.moves = moves
+        self.result = result
+        self.start = start
+
+    def __eq__(self, other):
+        return (isinstance(other, GameRecord) and self.moves == other.moves and self.result == other.result
+                and self.start == other.start)
+
+    def __repr__(self):
+        return f"GameRecord({len(self.moves)} moves, result={self.result!r})"
+
+
+def encode_record(record):
+    parts = [_record_head.pack(RESULTS.index(record.result), pack_position(*record.start), len(record.moves))]
+    for move in record.moves:
+        parts.append(bytes((len(move.path),)))
+        parts.append(bytes(move.path))
+    payload = b''.join(parts)
+    return _length.pack(len(payload)) + payload
+
+
+def decode_record(payload):
+    result, start, count = _record_head.unpack_from(payload)
+    offset = _record_head.size
+    moves = []
+    for _ in range(count):
+        length = payload[offset]
+        moves.append(Move.from_path(tuple(payload[offset + 1:offset + 1 + length])))
+        offset += 1 + length
+    return GameRecord(moves, RESULTS[result], unpack_position(start))
+
+
+def _check_header(header, path):
+    if len(header) < len(HEADER) or header[:4] != MAGIC:
+        raise ValueError(f"{path} is not a game record file")
+    if header[4] != VERSION:
+        raise ValueError(f"Unsupported game record version {header[4]} in {path}")
+
+
+class GameRecordWriter:
+    """Appends records to ``path``, writing the header if the file is new."""
+
+    def __init__(self, path):
+        self.path = path
+        self._stream = open(path, 'ab')
+        if self._stream.tell() == 0:
+            self._stream.write(HEADER)
+
+    def write(self, record):
+        self._stream.write(encode_record(record))
+
+    def flush(self):
+        self._stream.flush()
+
+    def close(self):
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_game_records(path, buffer_size=1 << 20):
+    """Stream records from ``path`` one at a time."""
+    with open(path, 'rb', buffering=buffer_size) as stream:
+        _check_header(stream.read(len(HEADER)), path)
+        while True:
+            prefix = stream.read(_length.size)
+            if not prefix:
+                return
+            if len(prefix) < _length.size:
+                raise ValueError(f"Truncated record in {path}")
+            (length,) = _length.unpack(prefix)
+            payload = stream.read(length)
+            if len(payload) < length:
+                raise ValueError(f"Truncated record in {path}")
+            yield decode_record(payload)
+
+
+class GameRecordReader:
+    """Random access to the records of a file through ``mmap``.
+
+    Opening the reader only walks the length prefixes to build an offset
+    index; record payloads are decoded on demand.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = b''
+        self._offsets = array('Q')
+        try:
+            self._index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _index(self):
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        _check_header(self._map[:len(HEADER)], self.path)
+        offset = len(HEADER)
+        while offset + _length.size <= size:
+            (length,) = _length.unpack_from(self._map, offset)
+            if offset + _length.size + length > size:
+                break
+            self._offsets.append(offset)
+            offset += _length.size + length
+        if offset != size:
+            # Same verdict as iter_game_records, including a partial length prefix.
+            raise ValueError(f"Truncated record in {self.path}")
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        offset = self._offsets[index]
+        (length,) = _length.unpack_from(self._map, offset)
+        start = offset + _length.size
+        return decode_record(self._map[start:start + length])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,301 @@
+"""Asyncio server hosting many human-vs-AI games over a JSON-lines protocol.
+
+Clients send one JSON object per line and get one back per request, in
+order. Every request may carry an ``id`` which is echoed in the reply.
+
+    {"op": "new", "ai": "black", "depth": 4}  -> {"ok": true, "game": 1, ...state}
+    {"op": "move", "game": 1, "move": [[2, 1], [3, 0]]}
+    {"op": "state", "game": 1}
+    {"op": "close", "game": 1}
+    {"op": "stats"}
+
+Moves use the ``GameBoard.move_piece`` coordinate format. A state reply has
+the ``position`` (white, black and king masks, side to move), the legal
+``moves``, the ``winner`` once the side to move is stuck, and ``ai_move``
+when the server replied for the AI. Failures reply ``{"ok": false, "error": ...}``.
+
+Sessions only keep the bitboards; one scratch ``GameBoard`` per server does
+the rules work. AI searches run in a process pool so the event loop never
+blocks, and games idle for ``idle_timeout`` seconds are evicted.
+
+    python game_server.py --port 8765
+    python game_server.py --unix /tmp/checkers.sock
+"""
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bitboard import WHITE_START, BLACK_START
+from game_board import GameBoard
+from move import Move
+from search import SearchEngine
+from transposition_table import worker_table
+
+
+def _ai_move(position, max_depth, time_limit, mandatory_capture, table_bytes):
+    # Runs in a worker process; the transposition table survives between games.
+    engine = SearchEngine(max_depth=max_depth, time_limit=time_limit, mandatory_capture=mandatory_capture,
+                          transposition_table=worker_table(table_bytes))
+    return engine.search(GameBoard.from_position(position)).move.to_coordinates()
+
+
+class GameSession:
+    __slots__ = ('white', 'black', 'kings', 'turn', 'ai', 'depth', 'time_limit', 'plies', 'last_active', 'busy')
+
+    def __init__(self, ai, depth, time_limit, now):
+        self.white = WHITE_START
+        self.black = BLACK_START
+        self.kings = 0
+        self.turn = 'white'
+        self.ai = ai
+        self.depth = depth
+        self.time_limit = time_limit
+        self.plies = 0
+        self.last_active = now
+        self.busy = False
+
+    def position(self):
+        return self.white, self.black, self.kings, self.turn
+
+
+class RequestError(Exception):
+    pass
+
+
+class GameServer:
+    def __init__(self, workers=None, executor=None, idle_timeout=600.0, eviction_interval=10.0,
+                 max_games=100_000, max_depth=8, max_time_limit=10.0, mandatory_capture=True,
+                 table_bytes=4 * 1024 * 1024):
+        self.idle_timeout = idle_timeout
+        self.eviction_interval = eviction_interval
+        self.max_games = max_games
+        self.max_depth = max_depth
+        self.max_time_limit = max_time_limit
+        self.mandatory_capture = mandatory_capture
+        self.table_bytes = table_bytes
+        self.games = {}
+        self.stats = {'created': 0, 'evicted': 0, 'moves': 0, 'ai_moves': 0, 'errors': 0}
+        self._board = GameBoard()
+        self._next_id = 1
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1)
+        self._servers = []
+        self._connections = {}
+        self._evictor = None
+
+    # Network side.
+
+    async def start(self, host='127.0.0.1', port=8765, path=None):
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle_client, path=path)
+        else:
+            server = await asyncio.start_server(self._handle_client, host, port)
+        self._servers.append(server)
+        if self._evictor is None:
+            self._evictor = asyncio.create_task(self._evict_loop())
+        return server
+
+    async def close(self):
+        if self._evictor is not None:
+            self._evictor.cancel()
+            self._evictor = None
+        for server in self._servers:
+            server.close()
+        # Dropping the transports ends every client loop with EOF.
+        for writer in self._connections.values():
+            writer.transport.abort()
+        if self._connections:
+            await asyncio.wait(list(self._connections))
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers = []
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle_client(self, reader, writer):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(json.dumps(await self.handle_line(line)).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    async def handle_line(self, line):
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RequestError("Invalid JSON")
+            if not isinstance(request, dict):
+                raise RequestError("Request must be a JSON object")
+            request_id = request.get('id')
+            handler = self._handlers.get(request.get('op'))
+            if handler is None:
+                raise RequestError(f"Unknown op: {request.get('op')!r}")
+            reply = await handler(self, request)
+            reply['ok'] = True
+        except RequestError as error:
+            self.stats['errors'] += 1
+            reply = {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # A bug must not kill the connection: the client still gets its reply.
+            self.stats['errors'] += 1
+            reply = {'ok': False, 'error': f"Internal error: {type(error).__name__}"}
+        if request_id is not None:
+            reply['id'] = request_id
+        return reply
+
+    # Game side.
+
+    def _session(self, request):
+        game_id = request.get('game')
+        session = self.games.get(game_id) if type(game_id) is int else None
+        if session is None:
+            raise RequestError(f"Unknown game: {request.get('game')!r}")
+        session.last_active = time.monotonic()
+        return session
+
+    def _state(self, game_id, session):
+        board = self._board
+        board.set_position(*session.position())
+        moves = board.generate_legal_moves(session.turn, self.mandatory_capture)
+        return {'game': game_id, 'position': list(session.position()), 'plies': session.plies,
+                'moves': [move.to_coordinates() for move in moves],
+                'winner': None if moves else ('black' if session.turn == 'white' else 'white')}
+
+    def _play(self, session, coordinates):
+        board = self._board
+        board.set_position(*session.position())
+        try:
+            move = Move.from_coordinates([tuple(square) for square in coordinates])
+        except (TypeError, ValueError):
+            raise RequestError("Malformed move")
+        if None in move.path or move not in board.generate_legal_moves(session.turn, self.mandatory_capture):
+            raise RequestError("Illegal move")
+        board.move_piece(move.to_coordinates())
+        session.white, session.black, session.kings, session.turn = board.position()
+        session.plies += 1
+
+    async def _ai_reply(self, game_id, session, state):
+        if session.ai != session.turn or state['winner'] is not None:
+            return state
+        session.busy = True
+        try:
+            coordinates = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _ai_move, session.position(), session.depth, session.time_limit,
+                self.mandatory_capture, self.table_bytes)
+        finally:
+            session.busy = False
+        if self.games.get(game_id) is not session:
+            raise RequestError("Game was closed during the AI search")
+        self._play(session, coordinates)
+        self.stats['ai_moves'] += 1
+        state = self._state(game_id, session)
+        state['ai_move'] = coordinates
+        return state
+
+    async def _new(self, request):
+        if len(self.games) >= self.max_games:
+            raise RequestError("Too many games")
+        ai = request.get('ai', 'black')
+        if ai not in ('white', 'black', None):
+            raise RequestError(f"Invalid ai color: {ai!r}")
+        depth = request.get('depth', 4)
+        if not isinstance(depth, int) or not 1 <= depth <= self.max_depth:
+            raise RequestError(f"depth must be between 1 and {self.max_depth}")
+        time_limit = request.get('time_limit')
+        if time_limit is not None and (type(time_limit) not in (int, float)
+                                       or not 0 < time_limit <= self.max_time_limit):
+            raise RequestError(f"time_limit must be a number of seconds up to {self.max_time_limit}")
+        game_id = self._next_id
+        self._next_id += 1
+        session = GameSession(ai, depth, time_limit, time.monotonic())
+        self.games[game_id] = session
+        self.stats['created'] += 1
+        try:
+            return await self._ai_reply(game_id, session, self._state(game_id, session))
+        except BaseException:
+            # The client never learns the id of a game whose first reply failed.
+            if self.games.get(game_id) is session:
+                del self.games[game_id]
+            raise
+
+    async def _move(self, request):
+        session = self._session(request)
+        game_id = request['game']
+        if session.busy:
+            raise RequestError("The AI is still thinking")
+        if session.ai == session.turn:
+            raise RequestError("Not your turn")
+        self._play(session, request.get('move') or ())
+        self.stats['moves'] += 1
+        return await self._ai_reply(game_id, session, self._state(game_id, session))
+
+    async def _get_state(self, request):
+        return self._state(request['game'], self._session(request))
+
+    async def _close_game(self, request):
+        self._session(request)
+        del self.games[request['game']]
+        return {'game': request['game']}
+
+    async def _stats(self, request):
+        return dict(self.stats, games=len(self.games))
+
+    _handlers = {'new': _new, 'move': _move, 'state': _get_state, 'close': _close_game, 'stats': _stats}
+
+    def evict_idle(self, now=None):
+        """Drop games untouched for ``idle_timeout`` seconds; returns how many."""
+        deadline = (time.monotonic() if now is None else now) - self.idle_timeout
+        idle = [game_id for game_id, session in self.games.items()
+                if session.last_active < deadline and not session.busy]
+        for game_id in idle:
+            del self.games[game_id]
+        self.stats['evicted'] += len(idle)
+        return len(idle)
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(self.eviction_interval)
+            self.evict_idle()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve human-vs-AI games over a JSON-lines socket protocol.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="listen on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--idle-timeout', type=float, default=600.0)
+    args = parser.parse_args()
+
+    async def serve():
+        server = GameServer(workers=args.workers, idle_timeout=args.idle_timeout)
+        listener = await server.start(args.host, args.port, args.unix)
+        print(f"Listening on {args.unix or f'{args.host}:{args.port}'}")
+        try:
+            await listener.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""Opt-in counters and timings for the board and search hot paths.
+
+``Instrumentation.install()`` swaps the listed ``GameBoard`` and
+``SearchEngine`` methods for timed wrappers and ``uninstall()`` puts the
+originals back, so code runs at full speed whenever instrumentation is off.
+Use it as a context manager::
+
+    profiler = Instrumentation()
+    with profiler:
+        SearchEngine(max_depth=6).search(GameBoard())
+    print(profiler.snapshot()['counters'])
+    profiler.write_folded('search.folded')  # flamegraph.pl or speedscope
+
+Timings go into power-of-two nanosecond histograms per operation, and self
+time is attributed to the stack of instrumented calls for the folded export.
+The call stack is shared, so one instrumentation should only be driven from
+a single thread.
+"""
+import time
+
+from game_board import GameBoard
+from move_tables import index_of
+from search import SearchEngine
+
+DEFAULT_OPERATIONS = (
+    (GameBoard, 'move_piece'),
+    (GameBoard, '_get_move_type'),
+    (GameBoard, '_is_valid_move'),
+    (GameBoard, 'generate_legal_moves'),
+    (GameBoard, 'make_move'),
+    (GameBoard, 'unmake_move'),
+    (SearchEngine, 'search'),
+    (SearchEngine, '_negamax'),
+    (SearchEngine, '_order_moves'),
+)
+
+_installed = None
+
+
+class OperationStats:
+    __slots__ = ('calls', 'total_ns', 'max_ns', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        # histogram[b] counts calls that took less than 2 ** b nanoseconds.
+        self.histogram = [0] * 64
+
+    def record(self, elapsed):
+        self.calls += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        self.histogram[min(elapsed.bit_length(), 63)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the histogram bucket holding the given fraction of calls."""
+        threshold = fraction * self.calls
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= threshold:
+                return 1 << bucket
+        return 0
+
+    def to_dict(self):
+        return {'calls': self.calls, 'total_ns': self.total_ns,
+                'mean_ns': self.total_ns / self.calls if self.calls else 0.0, 'max_ns': self.max_ns,
+                'p50_ns': self.percentile(0.5), 'p99_ns': self.percentile(0.99),
+                'histogram': {1 << bucket: count for bucket, count in enumerate(self.histogram) if count}}
+
+
+class Instrumentation:
+    def __init__(self, operations=DEFAULT_OPERATIONS):
+        self.operations = tuple(operations)
+        self.stats = {}
+        self.counters = dict.fromkeys(('failed_moves', 'capture_moves', 'captures', 'promotions'), 0)
+        self.folded = {}
+        self._stack = []
+        self._originals = []
+
+    def reset(self):
+        # Installed wrappers hold on to these objects, so clear them in place.
+        for stats in self.stats.values():
+            stats.__init__()
+        for name in self.counters:
+            self.counters[name] = 0
+        self.folded.clear()
+
+    @property
+    def installed(self):
+        return _installed is self
+
+    def install(self):
+        global _installed
+        if _installed is not None:
+            raise RuntimeError("Another Instrumentation is already installed")
+        for owner, name in self.operations:
+            original = owner.__dict__[name]
+            self._originals.append((owner, name, original))
+            setattr(owner, name, self._wrap(f'{owner.__name__}.{name}', original))
+        _installed = self
+
+    def uninstall(self):
+        global _installed
+        if _installed is not self:
+            return
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+        _installed = None
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def _wrap(self, label, function):
+        stats = self.stats.setdefault(label, OperationStats())
+        stack = self._stack
+        folded = self.folded
+        name = function.__name__.lstrip('_')
+        before = getattr(self, '_before_' + name, None)
+        after = getattr(self, '_after_' + name, None)
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            if stack:
+                parent = stack[-1][0]
+                # Direct recursion is folded into a single frame.
+                path = parent if parent == label or parent.endswith(';' + label) else parent + ';' + label
+            else:
+                path = label
+            # Hooks take the same arguments as the method, so they fail exactly when it would.
+            state = before(*args, **kwargs) if before is not None else None
+            frame = [path, 0]
+            stack.append(frame)
+            start = clock()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stack.pop()
+                folded[path] = folded.get(path, 0) + elapsed - frame[1]
+                if stack:
+                    stack[-1][1] += elapsed
+                stats.record(elapsed)
+            if after is not None:
+                after(state, result, *args, **kwargs)
+            return result
+
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        wrapper.__wrapped__ = function
+        return wrapper
+
+    # Event counters around the wrapped methods. ``move_piece`` checks the whole
+    # sequence before touching the board, so a failed move never rolls back.
+
+    def _before_move_piece(self, board, moves):
+        source = index_of(*moves[0]) if moves else None
+        was_king = source is not None and board.kings >> source & 1
+        return (board.white | board.black).bit_count(), was_king
+
+    def _after_move_piece(self, state, result, board, moves):
+        if not result:
+            self.counters['failed_moves'] += 1
+            return
+        pieces, was_king = state
+        self._count(pieces - (board.white | board.black).bit_count(),
+                    not was_king and board.kings >> index_of(*moves[-1]) & 1)
+
+    def _after_make_move(self, state, result, board, move):
+        self._count(move.captured.bit_count(), board._undo_stack[-1][2])
+
+    def _count(self, captured, promoted):
+        if captured:
+            self.counters['capture_moves'] += 1
+            self.counters['captures'] += captured
+        if promoted:
+            self.counters['promotions'] += 1
+
+    def snapshot(self):
+        """Per-operation statistics plus the event counters, as plain data.
+
+        ``total_ns`` includes nested and recursive calls; ``self_ns`` only
+        counts time not spent in other instrumented operations.
+        """
+        self_times = {}
+        for stack, elapsed in self.folded.items():
+            label = stack.rpartition(';')[2]
+            self_times[label] = self_times.get(label, 0) + elapsed
+        operations = {}
+        for label, stats in self.stats.items():
+            if stats.calls:
+                operations[label] = dict(stats.to_dict(), self_ns=self_times.get(label, 0))
+        return {'operations': operations, 'counters': dict(self.counters)}
+
+    def write_folded(self, path, unit_ns=1000):
+        """Write self time per call stack in the collapsed format of flamegraph.pl.
+
+        Weights are in units of ``unit_ns`` nanoseconds (microseconds by default).
+        """
+        with open(path, 'w') as stream:
+            for stack, elapsed in sorted(self.folded.items()):
+                weight = elapsed // unit_ns
+                if weight:
+                    stream.write(f'{stack} {weight}\n')
+
+
+def main():
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Profile a search and print per-operation statistics.")
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--folded', help="also write collapsed stacks for flamegraph.pl to this path")
+    args = parser.parse_args()
+
+    with Instrumentation() as profiler:
+        SearchEngine(max_depth=args.depth).search(GameBoard())
+    snapshot = profiler.snapshot()
+    for label, stats in sorted(snapshot['operations'].items(), key=lambda item: -item[1]['self_ns']):
+        print(f"{label:34s} {stats['calls']:9d} calls {stats['self_ns'] / 1e6:10.1f}ms self "
+              f"p50 {stats['p50_ns']:8d}ns p99 {stats['p99_ns']:8d}ns")
+    print(json.dumps(snapshot['counters']))
+    if args.folded:
+        profiler.write_folded(args.folded)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+"""Monte Carlo tree search over ``GameBoard.make_move``.
+
+Nodes live in an arena of parallel arrays indexed by node number; the
+children of a node are stored contiguously, so a node only records its first
+child and child count. Leaves are selected in batches with a virtual loss on
+the path, their playouts run in a process pool (or in-process with
+``workers=1``), then the results are backed up.
+
+Selection uses UCT or, with ``mode='puct'``, PUCT with priors from
+``prior(board, moves)`` (uniform by default). The tree below the move
+actually played is kept for the next ``search`` when the new position is
+found among the root's children or grandchildren.
+"""
+import math
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from game_board import GameBoard
+from search import evaluate
+from self_play import RandomPolicy
+
+
+def _rollouts(positions, seed, policy, rollout_plies, mandatory_capture, score_scale):
+    """Play each position out; rewards are for the side to move, 1 win, 0 loss.
+
+    Playouts cut off after ``rollout_plies`` are scored by a logistic of the
+    material evaluation.
+    """
+    rng = random.Random(seed)
+    board = GameBoard()
+    rewards = []
+    for position in positions:
+        board.set_position(*position)
+        color = board.turn
+        for _ in range(rollout_plies):
+            moves = board.generate_legal_moves(board.turn, mandatory_capture)
+            if not moves:
+                rewards.append(0.0 if board.turn == color else 1.0)
+                break
+            board.make_move(policy.choose(board, moves, rng))
+        else:
+            score = evaluate(board) if board.turn == color else -evaluate(board)
+            rewards.append(1.0 / (1.0 + math.exp(-score / score_scale)))
+    return rewards
+
+
+def material_prior(board, moves, temperature=100.0):
+    """PUCT priors: softmax of the material evaluation one ply ahead."""
+    scores = []
+    for move in moves:
+        board.make_move(move)
+        scores.append(-evaluate(board) / temperature)
+        board.unmake_move()
+    top = max(scores)
+    weights = [math.exp(score - top) for score in scores]
+    total = sum(weights)
+    return [weight / total for weight in weights]
+
+
+class MCTSResult:
+    def __init__(self, move, visits, value, playouts, elapsed, tree_nodes, children=()):
+        self.move = move
+        self.visits = visits
+        # Average reward of ``move`` for the side to move, from 0 to 1.
+        self.value = value
+        self.playouts = playouts
+        self.elapsed = elapsed
+        self.tree_nodes = tree_nodes
+        # (move, visits, value) for every root move, most visited first.
+        self.children = list(children)
+
+    @property
+    def playouts_per_second(self):
+        return self.playouts / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"MCTSResult(move={self.move!r}, visits={self.visits}, value={self.value:.3f}, "
+                f"playouts={self.playouts}, playouts/s={self.playouts_per_second:.0f})")
+
+
+class MCTSEngine:
+    """UCT / PUCT player.
+
+    ``iterations`` playouts are run per ``search`` unless ``time_limit``
+    (seconds) runs out first. ``batch_size`` leaves are selected before their
+    playouts are run, split between ``workers`` processes.
+    """
+
+    def __init__(self, iterations=1000, time_limit=None, exploration=1.4, mode='uct', prior=None, workers=1,
+                 batch_size=16, rollout_plies=40, rollout_policy=None, mandatory_capture=True, score_scale=200.0,
+                 reuse_tree=True, seed=0):
+        if mode not in ('uct', 'puct'):
+            raise ValueError(f"Unknown mode: {mode!r}")
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.mode = mode
+        self.prior = prior
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.rollout_plies = rollout_plies
+        self.rollout_policy = rollout_policy or RandomPolicy()
+        self.mandatory_capture = mandatory_capture
+        self.score_scale = score_scale
+        self.reuse_tree = reuse_tree
+        self._seed = seed
+        self._pool = None
+        self._clear()
+
+    def _clear(self):
+        self.moves = [None]
+        self.hashes = array('Q', [0])
+        self.parent = array('i', [-1])
+        self.first_child = array('i', [-1])
+        self.child_count = array('H', [0])
+        self.visits = array('I', [0])
+        # Total reward for the player who made the move into the node.
+        self.value = array('d', [0.0])
+        self.priors = array('f', [1.0])
+        self.terminal = bytearray(1)
+
+    def __len__(self):
+        return len(self.moves)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Arena.
+
+    def _expand(self, node, board):
+        moves = board.generate_legal_moves(board.turn, self.mandatory_capture)
+        if not moves:
+            self.terminal[node] = 1
+            return
+        priors = self.prior(board, moves) if self.prior is not None else [1.0 / len(moves)] * len(moves)
+        self.first_child[node] = len(self.moves)
+        self.child_count[node] = len(moves)
+        for move, prior in zip(moves, priors):
+            board.make_move(move)
+            self.hashes.append(board.hash)
+            board.unmake_move()
+            self.moves.append(move)
+            self.parent.append(node)
+            self.first_child.append(-1)
+            self.child_count.append(0)
+            self.visits.append(0)
+            self.value.append(0.0)
+            self.priors.append(prior)
+            self.terminal.append(0)
+
+    def _select_child(self, node):
+        first = self.first_child[node]
+        visits, value, priors = self.visits, self.value, self.priors
+        parent_visits = max(1, visits[node])
+        best, best_score = first, -math.inf
+        if self.mode == 'uct':
+            log_visits = math.log(parent_visits)
+            for child in range(first, first + self.child_count[node]):
+                count = visits[child]
+                if count == 0:
+                    return child
+                score = value[child] / count + self.exploration * math.sqrt(log_visits / count)
+                if score > best_score:
+                    best, best_score = child, score
+        else:
+            scale = self.exploration * math.sqrt(parent_visits)
+            for child in range(first, first + self.child_count[node]):
+                count = visits[child]
+                mean = value[child] / count if count else 0.5
+                score = mean + scale * priors[child] / (1 + count)
+                if score > best_score:
+                    best, best_score = child, score
+        return best
+
+    def _reroot(self, new_root):
+        # Copy the subtree under ``new_root`` into a fresh arena, breadth first.
+        moves, hashes, first_child, child_count = self.moves, self.hashes, self.first_child, self.child_count
+        visits, value, priors, terminal = self.visits, self.value, self.priors, self.terminal
+        self._clear()
+        self.hashes[0] = hashes[new_root]
+        self.visits[0] = visits[new_root]
+        self.value[0] = value[new_root]
+        self.terminal[0] = terminal[new_root]
+        queue = [(new_root, 0)]
+        for old_node, node in queue:
+            count = child_count[old_node]
+            if not count:
+                continue
+            start = first_child[old_node]
+            self.first_child[node] = len(self.moves)
+            self.child_count[node] = count
+            for old_child in range(start, start + count):
+                queue.append((old_child, len(self.moves)))
+                self.moves.append(moves[old_child])
+                self.hashes.append(hashes[old_child])
+                self.parent.append(node)
+                self.first_child.append(-1)
+                self.child_count.append(0)
+                self.visits.append(visits[old_child])
+                self.value.append(value[old_child])
+                self.priors.append(priors[old_child])
+                self.terminal.append(terminal[old_child])
+
+    def _find_reusable(self, board):
+        # The new root is the old root itself or one of its children or grandchildren.
+        candidates = [0]
+        for child in self._children(0):
+            candidates.append(child)
+            candidates.extend(self._children(child))
+        for node in candidates:
+            if self.hashes[node] == board.hash:
+                return node
+        return None
+
+    def _children(self, node):
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node]) if first >= 0 else range(0)
+
+    # Search.
+
+    def search(self, board, iterations=None, time_limit=None):
+        iterations = self.iterations if iterations is None else iterations
+        time_limit = self.time_limit if time_limit is None else time_limit
+        start = time.perf_counter()
+        deadline = None if time_limit is None else start + time_limit
+
+        node = self._find_reusable(board) if self.reuse_tree and len(self) > 1 else None
+        if node is None:
+            self._clear()
+            self.hashes[0] = board.hash
+        elif node != 0:
+            self._reroot(node)
+        if self.child_count[0] == 0 and not self.terminal[0]:
+            self._expand(0, board)
+        if self.terminal[0]:
+            return MCTSResult(None, 0, 0.0, 0, time.perf_counter() - start, len(self))
+
+        playouts = 0
+        while playouts < iterations and (deadline is None or time.perf_counter() < deadline):
+            batch = min(self.batch_size, iterations - playouts)
+            playouts += self._run_batch(board, batch)
+
+        children = sorted(self._children(0), key=lambda child: -self.visits[child])
+        best = children[0]
+        summary = [(self.moves[child], self.visits[child],
+                    self.value[child] / self.visits[child] if self.visits[child] else 0.0) for child in children]
+        return MCTSResult(self.moves[best], self.visits[best], summary[0][2], playouts,
+                          time.perf_counter() - start, len(self), summary)
+
+    def _run_batch(self, board, batch):
+        leaves, positions = [], []
+        for _ in range(batch):
+            path = [0]
+            node = 0
+            while self.child_count[node]:
+                node = self._select_child(node)
+                board.make_move(self.moves[node])
+                path.append(node)
+            if not self.terminal[node] and self.visits[node] > 0:
+                self._expand(node, board)
+                if self.child_count[node]:
+                    node = self._select_child(node)
+                    board.make_move(self.moves[node])
+                    path.append(node)
+            # Virtual loss: the visit counts now, the reward arrives with the backup.
+            for visited in path:
+                self.visits[visited] += 1
+            if self.terminal[node]:
+                self._backup(path, 0.0)
+            else:
+                leaves.append(path)
+                positions.append(board.position())
+            for _ in range(len(path) - 1):
+                board.unmake_move()
+
+        for path, reward in zip(leaves, self._playouts(positions)):
+            self._backup(path, reward)
+        return batch
+
+    def _backup(self, path, reward):
+        # ``reward`` is for the side to move at the leaf, i.e. not the player who moved into it.
+        for node in reversed(path):
+            reward = 1.0 - reward
+            self.value[node] += reward
+
+    def _playouts(self, positions):
+        self._seed += 1
+        if not positions:
+            return []
+        arguments = (self.rollout_policy, self.rollout_plies, self.mandatory_capture, self.score_scale)
+        if self.workers == 1:
+            return _rollouts(positions, self._seed, *arguments)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        shares = [positions[i::self.workers] for i in range(min(self.workers, len(positions)))]
+        futures = [self._pool.submit(_rollouts, share, self._seed * 1_000_003 + i, *arguments)
+                   for i, share in enumerate(shares)]
+        results = [future.result() for future in futures]
+        rewards = [0.0] * len(positions)
+        for i, share_rewards in enumerate(results):
+            rewards[i::self.workers] = share_rewards
+        return rewards
+
+
+def main():
+    import argparse
+
+    from search import SearchEngine
+
+    parser = argparse.ArgumentParser(description="Compare MCTS playouts/s with alpha-beta nodes/s.")
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--mode', choices=['uct', 'puct'], default='uct')
+    parser.add_argument('--depth', type=int, default=6)
+    args = parser.parse_args()
+
+    with MCTSEngine(iterations=args.iterations, workers=args.workers, batch_size=args.batch_size,
+                    mode=args.mode) as engine:
+        print(engine.search(GameBoard()))
+    print(SearchEngine(max_depth=args.depth).search(GameBoard()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+from bitboard import square_coordinates, square_index
+
+
+class Move:
+    """A move as the playable-square indices it visits plus a mask of captured squares."""
+
+    __slots__ = ('path', 'captured')
+
+    def __init__(self, path, captured=0):
+        self.path = path
+        self.captured = captured
+
+    @classmethod
+    def from_coordinates(cls, moves):
+        captured = 0
+        for (from_row, from_col), (to_row, to_col) in zip(moves, moves[1:]):
+            if abs(to_row - from_row) == 2:
+                captured |= 1 << square_index((from_row + to_row) // 2, (from_col + to_col) // 2)
+        return cls(tuple(square_index(row, col) for row, col in moves), captured)
+
+    @classmethod
+    def from_path(cls, path):
+        return cls.from_coordinates([square_coordinates(index) for index in path])
+
+    @property
+    def source(self):
+        return self.path[0]
+
+    @property
+    def target(self):
+        return self.path[-1]
+
+    @property
+    def is_capture(self):
+        return self.captured != 0
+
+    def to_coordinates(self):
+        return [square_coordinates(index) for index in self.path]
+
+    def __eq__(self, other):
+        return isinstance(other, Move) and self.path == other.path and self.captured == other.captured
+
+    def __hash__(self):
+        return hash((self.path, self.captured))
+
+    def __repr__(self):
+        return f"Move({self.to_coordinates()})"
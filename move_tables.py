@@ -0,0 +1,65 @@
+"""Board geometry precomputed once at import.
+
+Everything here is indexed by playable-square index (see ``bitboard``); pair
+tables are indexed by ``source * 32 + target``.
+"""
+from bitboard import square_coordinates, square_index
+
+# SQUARE_INDEX[row * 8 + col] is the playable index of (row, col) or None.
+SQUARE_INDEX = [square_index(row, col) for row in range(8) for col in range(8)]
+
+# Row direction a man of each color steps in.
+FORWARD_ROW_DIRECTION = {'white': 1, 'black': -1}
+
+
+def index_of(row, col):
+    if 0 <= row < 8 and 0 <= col < 8:
+        return SQUARE_INDEX[row * 8 + col]
+    return None
+
+
+def _neighbour(index, row_step, col_step, distance=1):
+    row, col = square_coordinates(index)
+    return index_of(row + row_step * distance, col + col_step * distance)
+
+
+def _targets(row_step):
+    return [tuple(target for target in (_neighbour(index, row_step, -1), _neighbour(index, row_step, 1))
+                  if target is not None)
+            for index in range(32)]
+
+
+DOWN_STEPS = _targets(1)
+UP_STEPS = _targets(-1)
+# Simple-move targets of a man, and of a king.
+MAN_STEPS = {'white': DOWN_STEPS, 'black': UP_STEPS}
+KING_STEPS = [DOWN_STEPS[index] + UP_STEPS[index] for index in range(32)]
+
+# JUMPS[index]: (middle bit, landing index) for every diagonal with room for a jump.
+JUMPS = [tuple((1 << _neighbour(index, row_step, col_step), _neighbour(index, row_step, col_step, 2))
+               for row_step in (1, -1) for col_step in (-1, 1)
+               if _neighbour(index, row_step, col_step, 2) is not None)
+         for index in range(32)]
+
+
+def _pair_tables():
+    step_row_direction = [0] * (32 * 32)
+    jump_middle = [-1] * (32 * 32)
+    for index in range(32):
+        for target in DOWN_STEPS[index]:
+            step_row_direction[index * 32 + target] = 1
+        for target in UP_STEPS[index]:
+            step_row_direction[index * 32 + target] = -1
+        for middle_bit, landing in JUMPS[index]:
+            jump_middle[index * 32 + landing] = middle_bit.bit_length() - 1
+    return step_row_direction, jump_middle
+
+
+# STEP_ROW_DIRECTION[pair]: +1 / -1 when target is a diagonal neighbour of source, else 0.
+# JUMP_MIDDLE[pair]: index of the jumped square when target is two diagonal steps away, else -1.
+STEP_ROW_DIRECTION, JUMP_MIDDLE = _pair_tables()
+
+# ADJACENT_COORDINATES[row * 8 + col]: orthogonal neighbours in up, down, left, right order.
+ADJACENT_COORDINATES = [tuple((row + i, col + j) for i, j in [(-1, 0), (1, 0), (0, -1), (0, 1)]
+                              if 0 <= row + i < 8 and 0 <= col + j < 8)
+                        for row in range(8) for col in range(8)]
@@ -0,0 +1,227 @@
+"""Opening books aggregated from game records and looked up by position hash.
+
+A book file holds one entry per (position, move) seen in the source games
+within the first ``max_ply`` plies. After a 16-byte header come all entry
+hashes as a sorted ``uint64`` column, then the matching entries::
+
+    uint16 move key (source << 5 | target, as in the transposition table)
+    uint16 earliest ply the move was played at
+    uint32 games
+    uint32 points for the side that played the move (2 per win, 1 per draw)
+
+``OpeningBook`` maps the file and binary-searches the hash column, so
+lookups cost a few microseconds whatever the book size.
+
+    python opening_book.py games.ckgr --output book.ckob --max-ply 16
+"""
+import bisect
+import json
+import mmap
+import random
+import struct
+
+from game_board import GameBoard
+from game_record import INITIAL_POSITION, iter_game_records
+from move import Move
+from transposition_table import move_key
+
+MAGIC = b'CKOB'
+VERSION = 1
+
+_header = struct.Struct('<4sBBHQ')
+_entry = struct.Struct('<HHII')
+_hash = struct.Struct('<Q')
+
+
+def _points(result, color):
+    if result == color:
+        return 2
+    if result == 'draw' or result is None:  # unknown results count as draws
+        return 1
+    return 0
+
+
+def build_book(records, max_ply=16):
+    """Aggregate games into ``{(hash, move key): [ply, games, points]}``.
+
+    ``records`` can be ``GameRecord`` or ``SelfPlayGame`` objects; anything
+    with ``moves`` and ``result`` and optionally ``start``.
+    """
+    entries = {}
+    board = GameBoard()
+    for record in records:
+        board.set_position(*getattr(record, 'start', INITIAL_POSITION))
+        for ply, move in enumerate(record.moves[:max_ply]):
+            key = (board.hash, move_key(move))
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = [ply, 0, 0]
+            entry[0] = min(entry[0], ply)
+            entry[1] += 1
+            entry[2] += _points(record.result, board.turn)
+            board.make_move(move)
+    return entries
+
+
+def write_book(path, entries, max_ply=16):
+    keys = sorted(entries)
+    with open(path, 'wb') as stream:
+        stream.write(_header.pack(MAGIC, VERSION, 0, max_ply, len(keys)))
+        stream.write(b''.join(_hash.pack(position) for position, _ in keys))
+        stream.write(b''.join(_entry.pack(key, *entries[position, key]) for position, key in keys))
+
+
+class BookEntry:
+    __slots__ = ('move', 'ply', 'games', 'points')
+
+    def __init__(self, move, ply, games, points):
+        self.move = move
+        self.ply = ply
+        self.games = games
+        self.points = points
+
+    @property
+    def score(self):
+        """Average result for the side to move, from 0 (lost) to 1 (won)."""
+        return self.points / (2 * self.games)
+
+    def __repr__(self):
+        return f"BookEntry({self.move!r}, ply={self.ply}, games={self.games}, score={self.score:.2f})"
+
+
+class OpeningBook:
+    """Read-only lookups into a file written by ``write_book``.
+
+    Entries first played at ``max_ply`` or later, or seen in fewer than
+    ``min_games`` games, are ignored.
+    """
+
+    def __init__(self, path, max_ply=None, min_games=1, mandatory_capture=True):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, built_ply, self.size = _header.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} opening book")
+        self.max_ply = built_ply if max_ply is None else min(max_ply, built_ply)
+        self.min_games = min_games
+        self.mandatory_capture = mandatory_capture
+        self._entries_at = _header.size + _hash.size * self.size
+        self._hashes = memoryview(self._map)[_header.size:self._entries_at].cast('Q')
+
+    def __len__(self):
+        return self.size
+
+    def entries(self, board):
+        """Book moves for ``board``, most played first; empty when out of book."""
+        position = board.hash
+        first = bisect.bisect_left(self._hashes, position)
+        if first == self.size or self._hashes[first] != position:
+            return []
+        legal = {}
+        for move in board.generate_legal_moves(board.turn, self.mandatory_capture):
+            legal.setdefault(move_key(move), move)
+        found = []
+        index = first
+        while index < self.size and self._hashes[index] == position:
+            key, ply, games, points = _entry.unpack_from(self._map, self._entries_at + _entry.size * index)
+            index += 1
+            # A key missing from the legal moves means a hash collision.
+            if key in legal and ply < self.max_ply and games >= self.min_games:
+                found.append(BookEntry(legal[key], ply, games, points))
+        found.sort(key=lambda entry: -entry.games)
+        return found
+
+    def choose(self, board, rng=random, weight='games'):
+        """Pick a book move at random, or ``None`` when out of book.
+
+        ``weight='games'`` follows how often each move was played,
+        ``weight='score'`` favours moves that scored well, and ``'best'``
+        always plays the most successful one.
+        """
+        found = self.entries(board)
+        if not found:
+            return None
+        if weight == 'best':
+            return max(found, key=lambda entry: (entry.score, entry.games)).move
+        if weight == 'games':
+            weights = [entry.games for entry in found]
+        elif weight == 'score':
+            weights = [entry.points + 1 for entry in found]
+        else:
+            raise ValueError(f"Unknown weight: {weight!r}")
+        return rng.choices(found, weights)[0].move
+
+    def close(self):
+        self._hashes.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BookPolicy:
+    """Self-play policy that plays from the book and falls back to ``fallback``."""
+
+    def __init__(self, path, fallback, max_ply=None, min_games=1, weight='games'):
+        self.path = path
+        self.fallback = fallback
+        self.max_ply = max_ply
+        self.min_games = min_games
+        self.weight = weight
+        self._book = None
+
+    def choose(self, board, moves, rng):
+        if self._book is None:
+            self._book = OpeningBook(self.path, self.max_ply, self.min_games)
+        move = self._book.choose(board, rng, self.weight)
+        if move is not None and move in moves:
+            return move
+        return self.fallback.choose(board, moves, rng)
+
+    def __getstate__(self):
+        # The mapped book is reopened in each worker process.
+        state = self.__dict__.copy()
+        state['_book'] = None
+        return state
+
+
+def _read_jsonl(path):
+    with open(path) as stream:
+        for line in stream:
+            game = json.loads(line)
+            yield _JsonGame([Move.from_coordinates([tuple(square) for square in move])
+                             for move in game['moves']], game['result'])
+
+
+class _JsonGame:
+    def __init__(self, moves, result):
+        self.moves = moves
+        self.result = result
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build an opening book from recorded games.")
+    parser.add_argument('games', nargs='+', help="game record files, or .jsonl from self_play.py")
+    parser.add_argument('--output', default='book.ckob')
+    parser.add_argument('--max-ply', type=int, default=16)
+    args = parser.parse_args()
+
+    def records():
+        for path in args.games:
+            yield from _read_jsonl(path) if path.endswith('.jsonl') else iter_game_records(path)
+
+    start = time.perf_counter()
+    entries = build_book(records(), args.max_ply)
+    write_book(args.output, entries, args.max_ply)
+    print(f"{len(entries)} entries in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_board import GameBoard
+from move import Move
+from search import SearchEngine, SearchResult, MATE_SCORE, evaluate
+from transposition_table import worker_table
+
+
+def _search_subset(position, root_moves, max_depth, time_limit, node_limit, mandatory_capture, table_bytes):
+    # Runs in a worker process; the transposition table survives between tasks.
+    engine = SearchEngine(max_depth=max_depth, time_limit=time_limit, node_limit=node_limit,
+                          mandatory_capture=mandatory_capture, transposition_table=worker_table(table_bytes))
+    board = GameBoard.from_position(position)
+    moves = [Move(path, captured) for path, captured in root_moves]
+    result = engine.search(board, root_moves=moves)
+    return result.nodes, [(depth, (move.path, move.captured), score) for depth, move, score in result.iterations]
+
+
+class ParallelSearchEngine:
+    """Root-splitting search: legal root moves are dealt out to a process pool.
+
+    Workers receive ``GameBoard.position()`` tuples and plain move tuples, run
+    an ordinary ``SearchEngine`` restricted to their share of the root, and
+    report every completed iteration. Results are merged at the deepest depth
+    all workers completed, breaking ties by root move order, so the outcome
+    does not depend on which worker finishes first.
+    """
+
+    def __init__(self, workers=None, max_depth=64, time_limit=None, node_limit=None,
+                 mandatory_capture=True, transposition_table_bytes=16 * 1024 * 1024):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.mandatory_capture = mandatory_capture
+        self.transposition_table_bytes = transposition_table_bytes
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def search(self, board, time_limit=None, node_limit=None, max_depth=None):
+        time_limit = self.time_limit if time_limit is None else time_limit
+        node_limit = self.node_limit if node_limit is None else node_limit
+        max_depth = self.max_depth if max_depth is None else max_depth
+        start = time.perf_counter()
+
+        serial = SearchEngine(mandatory_capture=self.mandatory_capture)
+        root_moves = serial._order_moves(board.generate_legal_moves(board.turn, self.mandatory_capture), 0)
+        if len(root_moves) <= 1:
+            return serial.search(board, time_limit=time_limit, node_limit=node_limit, max_depth=max_depth)
+
+        # Deal ordered moves round-robin so every worker gets some captures.
+        shares = [root_moves[i::self.workers] for i in range(min(self.workers, len(root_moves)))]
+        share_node_limit = None if node_limit is None else max(1, node_limit // len(shares))
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        position = board.position()
+        futures = [self._pool.submit(_search_subset, position, [(move.path, move.captured) for move in share],
+                                     max_depth, time_limit, share_node_limit, self.mandatory_capture,
+                                     self.transposition_table_bytes)
+                   for share in shares]
+        outcomes = [future.result() for future in futures]
+
+        nodes = sum(share_nodes for share_nodes, _ in outcomes)
+        move, score, depth = self._merge(root_moves, [iterations for _, iterations in outcomes])
+        if score is None:
+            score = evaluate(board)
+        return SearchResult(move, score, depth, nodes, time.perf_counter() - start)
+
+    @staticmethod
+    def _merge(root_moves, share_iterations):
+        if not all(share_iterations):
+            # Some root moves were never searched, so no depth was completed by every worker.
+            return root_moves[0], None, 0
+
+        # A share that proved a mate stopped early but its answer holds at every depth.
+        open_depths = [iterations[-1][0] for iterations in share_iterations
+                       if abs(iterations[-1][2]) < MATE_SCORE - SearchEngine.MAX_PLY]
+        depth = min(open_depths) if open_depths else max(iterations[-1][0] for iterations in share_iterations)
+
+        order = {(move.path, move.captured): i for i, move in enumerate(root_moves)}
+        best = None
+        for iterations in share_iterations:
+            candidates = [entry for entry in iterations if entry[0] <= depth]
+            if not candidates:
+                continue
+            _, move, score = candidates[-1]
+            if best is None or (-score, order[move]) < (-best[1], order[best[0]]):
+                best = (move, score)
+        path, captured = best[0]
+        return Move(path, captured), best[1], depth
@@ -0,0 +1,136 @@
+"""Perft: count the leaf nodes of the legal move tree to a fixed depth.
+
+Counts use mandatory capture and this repo's rules (men capture in every
+direction, promotion only at the end of a move), so beyond the first few
+plies they differ from published counts for standard checkers. The reference
+numbers below were produced by this generator and cross-checked against
+``move_piece`` by the test-suite; any change to them is a rules change.
+
+    python perft.py --depth 7
+"""
+import time
+
+from bitboard import square_index
+from game_board import GameBoard
+
+INITIAL = (
+    " o o o o",
+    "o o o o ",
+    " o o o o",
+    ". . . . ",
+    " . . . .",
+    "x x x x ",
+    " x x x x",
+    "x x x x ",
+)
+
+KINGS_ENDGAME = (
+    " . . . .",
+    ". . O . ",
+    " . . . .",
+    ". x . . ",
+    " . . X .",
+    ". . o . ",
+    " x . . .",
+    ". . . . ",
+)
+
+CAPTURE_CHAINS = (
+    " . . . .",
+    "o . o . ",
+    " x x . .",
+    ". . . . ",
+    " x x x .",
+    ". . . . ",
+    " x . x .",
+    ". . . . ",
+)
+
+# name -> (diagram, side to move, {depth: leaf nodes})
+PERFT_POSITIONS = {
+    'initial': (INITIAL, 'white', {1: 7, 2: 49, 3: 302, 4: 1469, 5: 7482, 6: 37986, 7: 190146}),
+    'kings_endgame': (KINGS_ENDGAME, 'white', {1: 1, 2: 4, 3: 19, 4: 63, 5: 278, 6: 826, 7: 3619}),
+    'capture_chains': (CAPTURE_CHAINS, 'white', {1: 6, 2: 24, 3: 36, 4: 175, 5: 533, 6: 2267, 7: 5904}),
+}
+
+_SYMBOLS = {'o': ('white', False), 'O': ('white', True), 'x': ('black', False), 'X': ('black', True)}
+
+
+def parse_diagram(rows, turn='white'):
+    """Build a board from eight rows drawn like ``GameBoard.display`` without spacing."""
+    white = black = kings = 0
+    for row, line in enumerate(rows):
+        for col, symbol in enumerate(line):
+            if symbol not in _SYMBOLS:
+                continue
+            index = square_index(row, col)
+            if index is None:
+                raise ValueError(f"Piece on a white square at {(row, col)}")
+            color, is_king = _SYMBOLS[symbol]
+            if color == 'white':
+                white |= 1 << index
+            else:
+                black |= 1 << index
+            if is_king:
+                kings |= 1 << index
+    board = GameBoard()
+    board.set_position(white, black, kings, turn)
+    return board
+
+
+def perft(board, depth, mandatory_capture=True):
+    if depth == 0:
+        return 1
+    moves = board.generate_legal_moves(board.turn, mandatory_capture)
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        board.make_move(move)
+        nodes += perft(board, depth - 1, mandatory_capture)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth, mandatory_capture=True):
+    """Leaf counts below each root move, for bisecting a wrong total."""
+    counts = {}
+    for move in board.generate_legal_moves(board.turn, mandatory_capture):
+        board.make_move(move)
+        counts[move] = perft(board, depth - 1, mandatory_capture)
+        board.unmake_move()
+    return counts
+
+
+def timed_perft(board, depth, mandatory_capture=True):
+    """Return ``(nodes, seconds, nodes_per_second)``."""
+    start = time.perf_counter()
+    nodes = perft(board, depth, mandatory_capture)
+    elapsed = time.perf_counter() - start
+    return nodes, elapsed, nodes / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Perft counts and move generation throughput.")
+    parser.add_argument('--depth', type=int, default=6)
+    parser.add_argument('--position', choices=sorted(PERFT_POSITIONS), action='append')
+    args = parser.parse_args()
+
+    failed = False
+    for name in args.position or PERFT_POSITIONS:
+        diagram, turn, expected = PERFT_POSITIONS[name]
+        print(name)
+        for depth in range(1, args.depth + 1):
+            nodes, elapsed, nps = timed_perft(parse_diagram(diagram, turn), depth)
+            status = ''
+            if depth in expected:
+                status = 'ok' if nodes == expected[depth] else f'MISMATCH (expected {expected[depth]})'
+                failed |= nodes != expected[depth]
+            print(f"  depth {depth:2d} {nodes:12d} nodes {elapsed:8.3f}s {nps:10.0f} nodes/s  {status}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+import time
+
+from transposition_table import EXACT, LOWER_BOUND, UPPER_BOUND, move_key
+
+MAN_VALUE = 100
+KING_VALUE = 150
+MATE_SCORE = 100000
+INFINITY = MATE_SCORE + 1
+
+
+def evaluate(board):
+    """Material balance from the point of view of the side to move."""
+    white_men = (board.white & ~board.kings).bit_count()
+    black_men = (board.black & ~board.kings).bit_count()
+    white_kings = (board.white & board.kings).bit_count()
+    black_kings = (board.black & board.kings).bit_count()
+    score = (white_men - black_men) * MAN_VALUE + (white_kings - black_kings) * KING_VALUE
+    return score if board.turn == 'white' else -score
+
+
+def _score_to_table(score, ply):
+    # Mate scores are stored relative to the node, not to the root.
+    if score >= MATE_SCORE - SearchEngine.MAX_PLY:
+        return score + ply
+    if score <= -MATE_SCORE + SearchEngine.MAX_PLY:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score >= MATE_SCORE - SearchEngine.MAX_PLY:
+        return score - ply
+    if score <= -MATE_SCORE + SearchEngine.MAX_PLY:
+        return score + ply
+    return score
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+    def __init__(self, move, score, depth, nodes, elapsed, iterations=()):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+        # (depth, move, score) for every completed iteration.
+        self.iterations = list(iterations)
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"SearchResult(move={self.move!r}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, nps={self.nodes_per_second:.0f})")
+
+
+class SearchEngine:
+    """Negamax alpha-beta with iterative deepening over ``GameBoard.make_move``.
+
+    The search stops at ``max_depth`` or as soon as the wall-clock ``time_limit``
+    (seconds) or ``node_limit`` is exhausted, returning the best move of the
+    last fully searched depth. An optional ``TranspositionTable`` caches
+    results by ``board.hash`` across iterations and searches, and an optional
+    ``Tablebase`` scores covered endgames exactly.
+    """
+
+    CHECK_INTERVAL = 1024
+    MAX_PLY = 128
+
+    def __init__(self, max_depth=64, time_limit=None, node_limit=None, mandatory_capture=True,
+                 evaluate=evaluate, transposition_table=None, tablebase=None):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.mandatory_capture = mandatory_capture
+        self.evaluate = evaluate
+        self.transposition_table = transposition_table
+        self.tablebase = tablebase
+        self.nodes = 0
+        self._deadline = None
+        self._node_limit = None
+        self._next_check = 0
+        self._killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self._history = [0] * (32 * 32)
+
+    def search(self, board, time_limit=None, node_limit=None, max_depth=None, root_moves=None):
+        """Search ``board`` for the side to move.
+
+        ``root_moves`` restricts the root to a subset of the legal moves, which
+        is how the parallel search splits work between processes.
+        """
+        time_limit = self.time_limit if time_limit is None else time_limit
+        node_limit = self.node_limit if node_limit is None else node_limit
+        max_depth = self.max_depth if max_depth is None else max_depth
+
+        start = time.perf_counter()
+        self.nodes = 0
+        self._deadline = None if time_limit is None else start + time_limit
+        self._node_limit = node_limit
+        self._next_check = 0
+        self._killers = [[None, None] for _ in range(self.MAX_PLY)]
+        self._history = [0] * (32 * 32)
+        if self.transposition_table is not None:
+            self.transposition_table.new_search()
+
+        if root_moves is None:
+            root_moves = board.generate_legal_moves(board.turn, self.mandatory_capture)
+            if len(root_moves) == 1:
+                return SearchResult(root_moves[0], self.evaluate(board), 0, 0, time.perf_counter() - start)
+        if not root_moves:
+            return SearchResult(None, -MATE_SCORE, 0, 0, time.perf_counter() - start)
+
+        best_move, best_score, completed_depth = root_moves[0], -INFINITY, 0
+        iterations = []
+        undo_depth = len(board._undo_stack)
+        for depth in range(1, max_depth + 1):
+            try:
+                move, score = self._search_root(board, root_moves, depth, best_move)
+            except SearchTimeout:
+                while len(board._undo_stack) > undo_depth:
+                    board.unmake_move()
+                break
+            best_move, best_score, completed_depth = move, score, depth
+            iterations.append((depth, move, score))
+            if abs(score) >= MATE_SCORE - self.MAX_PLY:
+                break
+
+        if not iterations:
+            # The budget ran out inside depth 1: the move is unsearched, so is the score.
+            best_score = self.evaluate(board)
+        return SearchResult(best_move, best_score, completed_depth, self.nodes, time.perf_counter() - start,
+                            iterations)
+
+    def _check_budget(self):
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchTimeout()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        self._next_check = self.nodes + self.CHECK_INTERVAL
+        if self._node_limit is not None:
+            self._next_check = min(self._next_check, self._node_limit)
+
+    def _search_root(self, board, moves, depth, previous_best):
+        moves = self._order_moves(moves, 0, move_key(previous_best))
+        alpha, best_move = -INFINITY, moves[0]
+        for move in moves:
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -INFINITY, -alpha, 1)
+            board.unmake_move()
+            if score > alpha:
+                alpha, best_move = score, move
+        return best_move, alpha
+
+    def _negamax(self, board, depth, alpha, beta, ply):
+        if self.nodes >= self._next_check:
+            self._check_budget()
+        self.nodes += 1
+
+        moves = board.generate_legal_moves(board.turn, self.mandatory_capture)
+        if not moves:
+            return -MATE_SCORE + ply
+        if ply >= self.MAX_PLY - 1:
+            return self.evaluate(board)
+
+        if self.tablebase is not None and (board.white | board.black).bit_count() <= self.tablebase.max_pieces:
+            outcome, distance = self.tablebase.probe(board)
+            if outcome == 'win':
+                return MATE_SCORE - ply - distance
+            if outcome == 'loss':
+                return -MATE_SCORE + ply + distance
+            return 0
+
+        table = self.transposition_table if depth > 0 else None
+        hash_move = None
+        if table is not None:
+            entry = table.probe(board.hash)
+            if entry is not None:
+                entry_depth, bound, score, hash_move = entry
+                if entry_depth >= depth:
+                    score = _score_from_table(score, ply)
+                    if (bound == EXACT or (bound == LOWER_BOUND and score >= beta)
+                            or (bound == UPPER_BOUND and score <= alpha)):
+                        return score
+
+        original_alpha = alpha
+        best_score = -INFINITY
+        if depth <= 0:
+            # Quiescence: only resolve pending captures past the horizon.
+            if not moves[0].is_capture:
+                return self.evaluate(board)
+            if not self.mandatory_capture:
+                stand_pat = self.evaluate(board)
+                if stand_pat >= beta:
+                    return stand_pat
+                best_score = stand_pat
+                alpha = max(alpha, stand_pat)
+                moves = [move for move in moves if move.is_capture]
+
+        best_move = None
+        for move in self._order_moves(moves, ply, hash_move):
+            board.make_move(move)
+            score = -self._negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            board.unmake_move()
+            if score > best_score:
+                best_score, best_move = score, move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if not move.is_capture:
+                            self._store_killer(move, ply)
+                            self._history[move.source * 32 + move.target] += depth * depth
+                        break
+
+        if table is not None:
+            if best_score <= original_alpha:
+                bound = UPPER_BOUND
+            elif best_score >= beta:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            table.store(board.hash, depth, bound, _score_to_table(best_score, ply), move_key(best_move))
+        return best_score
+
+    def _store_killer(self, move, ply):
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+    def _order_moves(self, moves, ply, first=None):
+        killers = self._killers[ply]
+        history = self._history
+
+        def priority(move):
+            if first is not None and move.source << 5 | move.target == first:
+                return 1 << 30
+            if move.is_capture:
+                return (1 << 28) + move.captured.bit_count()
+            if move == killers[0]:
+                return 1 << 27
+            if move == killers[1]:
+                return (1 << 27) - 1
+            return history[move.source * 32 + move.target]
+
+        return sorted(moves, key=priority, reverse=True)
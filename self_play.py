@@ -0,0 +1,240 @@
+import json
+import os
+import random
+import time
+from itertools import islice
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from bitboard import WHITE_START, BLACK_START
+from game_board import GameBoard
+from game_record import HEADER, GameRecord, encode_record
+from search import SearchEngine, evaluate
+
+
+class RandomPolicy:
+    def choose(self, board, moves, rng):
+        return moves[rng.randrange(len(moves))]
+
+
+class GreedyPolicy:
+    """Pick the move with the best static evaluation one ply ahead."""
+
+    def __init__(self, evaluate=evaluate):
+        self.evaluate = evaluate
+
+    def choose(self, board, moves, rng):
+        best_score, best_moves = None, []
+        for move in moves:
+            board.make_move(move)
+            score = -self.evaluate(board)
+            board.unmake_move()
+            if best_score is None or score > best_score:
+                best_score, best_moves = score, [move]
+            elif score == best_score:
+                best_moves.append(move)
+        return best_moves[rng.randrange(len(best_moves))]
+
+
+class SearchPolicy:
+    def __init__(self, max_depth=4, time_limit=None, node_limit=None):
+        self.max_depth = max_depth
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self._engine = None
+
+    def choose(self, board, moves, rng):
+        if self._engine is None:
+            self._engine = SearchEngine(max_depth=self.max_depth, time_limit=self.time_limit,
+                                        node_limit=self.node_limit)
+        return self._engine.search(board, root_moves=moves).move
+
+    def __getstate__(self):
+        # Engines are rebuilt in each worker process.
+        state = self.__dict__.copy()
+        state['_engine'] = None
+        return state
+
+
+class SelfPlayGame:
+    def __init__(self, index, moves, result, reason):
+        self.index = index
+        self.moves = moves
+        self.result = result  # 'white', 'black' or 'draw'
+        self.reason = reason
+
+    @property
+    def plies(self):
+        return len(self.moves)
+
+    def to_dict(self):
+        return {'index': self.index, 'result': self.result, 'reason': self.reason,
+                'moves': [move.to_coordinates() for move in self.moves]}
+
+
+class SelfPlayStats:
+    def __init__(self, games, positions, elapsed, results):
+        self.games = games
+        self.positions = positions
+        self.elapsed = elapsed
+        self.results = results
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def positions_per_second(self):
+        return self.positions / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (f"SelfPlayStats(games={self.games}, positions={self.positions}, "
+                f"games/s={self.games_per_second:.1f}, positions/s={self.positions_per_second:.0f}, "
+                f"results={self.results})")
+
+
+def play_game(board, white_policy, black_policy, rng, draw_plies=80, max_plies=400, mandatory_capture=True,
+              index=0):
+    """Play one game on ``board`` from the initial position.
+
+    The game is lost by the side to move when it has no legal move (which
+    includes having no piece left). It is drawn after ``draw_plies`` plies
+    without a capture or a man move, or after ``max_plies`` in total.
+    """
+    board.set_position(WHITE_START, BLACK_START)
+    policies = {'white': white_policy, 'black': black_policy}
+    moves_played = []
+    quiet_plies = 0
+    while True:
+        moves = board.generate_legal_moves(board.turn, mandatory_capture)
+        if not moves:
+            winner = 'black' if board.turn == 'white' else 'white'
+            return SelfPlayGame(index, moves_played, winner, 'no moves')
+        if quiet_plies >= draw_plies:
+            return SelfPlayGame(index, moves_played, 'draw', 'no progress')
+        if len(moves_played) >= max_plies:
+            return SelfPlayGame(index, moves_played, 'draw', 'max plies')
+
+        move = policies[board.turn].choose(board, moves, rng)
+        if move.is_capture or not board.kings >> move.source & 1:
+            quiet_plies = 0
+        else:
+            quiet_plies += 1
+        board.make_move(move)
+        moves_played.append(move)
+
+
+def _play_batch(first_index, count, seed, white_policy, black_policy, draw_plies, max_plies, mandatory_capture):
+    # One board is reused for every game in the batch.
+    board = GameBoard()
+    games = []
+    for index in range(first_index, first_index + count):
+        rng = random.Random(seed * 1_000_003 + index)
+        games.append(play_game(board, white_policy, black_policy, rng, draw_plies, max_plies,
+                               mandatory_capture, index))
+    return games
+
+
+def write_jsonl(games, stream):
+    for game in games:
+        stream.write(json.dumps(game.to_dict()))
+        stream.write('\n')
+
+
+def write_game_records(games, stream):
+    # Binary writer for ``SelfPlayRunner.run(..., mode='wb')``; see game_record.
+    if stream.tell() == 0:
+        stream.write(HEADER)
+    for game in games:
+        stream.write(encode_record(GameRecord(game.moves, game.result)))
+
+
+class SelfPlayRunner:
+    """Play many games across worker processes and stream them to disk.
+
+    Games are dealt out in batches of ``batch_size``, with at most two
+    batches per worker in flight; each finished batch is handed to
+    ``writer(games, stream)`` as soon as it arrives and then dropped, so
+    memory stays bounded however many games are played. Game ``i`` is seeded from ``seed``
+    and ``i`` only, so results are reproducible for any worker count.
+    """
+
+    def __init__(self, white_policy=None, black_policy=None, workers=None, batch_size=64, draw_plies=80,
+                 max_plies=400, mandatory_capture=True, seed=0, writer=write_jsonl):
+        self.white_policy = white_policy or RandomPolicy()
+        self.black_policy = black_policy or self.white_policy
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.draw_plies = draw_plies
+        self.max_plies = max_plies
+        self.mandatory_capture = mandatory_capture
+        self.seed = seed
+        self.writer = writer
+
+    def _batches(self, games):
+        for first in range(0, games, self.batch_size):
+            yield (first, min(self.batch_size, games - first), self.seed, self.white_policy, self.black_policy,
+                   self.draw_plies, self.max_plies, self.mandatory_capture)
+
+    def run(self, games, output_path=None, mode='w'):
+        start = time.perf_counter()
+        played = positions = 0
+        results = {'white': 0, 'black': 0, 'draw': 0}
+        stream = open(output_path, mode) if output_path is not None else None
+        try:
+            for batch in self._run_batches(games):
+                played += len(batch)
+                for game in batch:
+                    positions += game.plies + 1
+                    results[game.result] += 1
+                if stream is not None:
+                    self.writer(batch, stream)
+        finally:
+            if stream is not None:
+                stream.close()
+        return SelfPlayStats(played, positions, time.perf_counter() - start, results)
+
+    def _run_batches(self, games):
+        if self.workers == 1:
+            for batch in self._batches(games):
+                yield _play_batch(*batch)
+            return
+        batches = self._batches(games)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = {pool.submit(_play_batch, *batch) for batch in islice(batches, 2 * self.workers)}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                # Refill the window first so workers stay busy while the writer runs.
+                for batch in islice(batches, len(done)):
+                    pending.add(pool.submit(_play_batch, *batch))
+                for future in done:
+                    yield future.result()
+                del done
+
+
+POLICIES = {'random': RandomPolicy, 'greedy': GreedyPolicy, 'search': SearchPolicy}
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate self-play games.")
+    parser.add_argument('games', type=int)
+    parser.add_argument('--output', default='games.jsonl')
+    parser.add_argument('--white', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--black', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--draw-plies', type=int, default=80)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=['jsonl', 'binary'], default='jsonl')
+    args = parser.parse_args()
+
+    binary = args.format == 'binary'
+    runner = SelfPlayRunner(POLICIES[args.white](), POLICIES[args.black](), workers=args.workers,
+                            batch_size=args.batch_size, draw_plies=args.draw_plies, seed=args.seed,
+                            writer=write_game_records if binary else write_jsonl)
+    print(runner.run(args.games, args.output, mode='wb' if binary else 'w'))
+
+
+if __name__ == '__main__':
+    main()
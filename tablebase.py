@@ -0,0 +1,298 @@
+"""Endgame tablebases built by retrograde analysis, probed through ``mmap``.
+
+Every position with ``k`` pieces gets a slot: the occupied squares are ranked
+as a combination, each piece contributes a base-4 digit (white man, black
+man, white king, black king) and the lowest bit is the side to move. A slot
+holds one byte: 0 for a draw, ``d + 1`` when the side to move wins (odd
+``d``) or loses (even ``d``) in ``d`` plies, and 255 for positions that
+cannot occur (a man on its promotion row).
+
+Tables are solved from 1 piece upwards so captures can look up the smaller
+tables. On disk they are split into fixed-size zlib-compressed blocks with
+an offset index; ``Tablebase`` maps the file and keeps recently used blocks
+in an LRU cache.
+
+    python tablebase.py build --pieces 3 --output endgame.cktb
+"""
+import mmap
+import struct
+import zlib
+from array import array
+from collections import OrderedDict
+from math import comb
+
+from bitboard import PROMOTION_ROWS, iter_bits
+from game_board import GameBoard
+
+MAGIC = b'CKTB'
+VERSION = 1
+BLOCK_SIZE = 4096
+DRAW = 0
+INVALID = 255
+
+_header = struct.Struct('<4sBBHI')
+_section = struct.Struct('<QII')
+_offset = struct.Struct('<Q')
+
+
+def table_size(pieces):
+    return comb(32, pieces) * 4 ** pieces * 2
+
+
+def position_index(white, black, kings, turn):
+    occupied = white | black
+    rank = kinds = 0
+    for i, square in enumerate(iter_bits(occupied), 1):
+        rank += comb(square, i)
+        kinds = kinds * 4 + (black >> square & 1) + 2 * (kings >> square & 1)
+    return ((rank << 2 * occupied.bit_count()) | kinds) << 1 | (turn == 'black')
+
+
+def index_position(index, pieces):
+    turn = 'black' if index & 1 else 'white'
+    index >>= 1
+    kinds = index & ((1 << 2 * pieces) - 1)
+    rank = index >> 2 * pieces
+    squares = []
+    for i in range(pieces, 0, -1):
+        square = i - 1
+        while comb(square + 1, i) <= rank:
+            square += 1
+        squares.append(square)
+        rank -= comb(square, i)
+    white = black = kings = 0
+    for square in squares:  # highest square first, i.e. the last kind digit
+        kind = kinds & 3
+        kinds >>= 2
+        if kind & 1:
+            black |= 1 << square
+        else:
+            white |= 1 << square
+        if kind & 2:
+            kings |= 1 << square
+    return white, black, kings, turn
+
+
+def _is_valid(white, black, kings):
+    return not (white & ~kings & PROMOTION_ROWS['white'] or black & ~kings & PROMOTION_ROWS['black'])
+
+
+def decode_value(value):
+    """Map a table byte to ``('win' | 'loss' | 'draw', plies)``; ``None`` for invalid slots."""
+    if value == INVALID:
+        return None
+    if value == DRAW:
+        return 'draw', 0
+    distance = value - 1
+    return ('win' if distance & 1 else 'loss'), distance
+
+
+def solve_table(pieces, smaller):
+    """Solve every position with exactly ``pieces`` pieces.
+
+    ``smaller`` maps piece counts below ``pieces`` to their solved value
+    tables. Returns a ``bytearray`` of slot values.
+    """
+    total = table_size(pieces)
+    values = bytearray(total)
+    best = array('H', [0xFFFF]) * total          # tentative distance
+    remaining = array('I', bytes(4 * total))      # unresolved children (+1 if a child is a draw)
+    longest_win = array('H', bytes(2 * total))    # longest child win seen so far
+    winning = bytearray(total)                    # some child is already known to lose
+    buckets = {}
+    parents, children = array('I'), array('I')
+    board = GameBoard()
+
+    def push(index, distance):
+        if distance & 1:
+            winning[index] = 1
+        elif winning[index]:
+            return
+        if distance < best[index]:
+            best[index] = distance
+            buckets.setdefault(distance, []).append(index)
+
+    for index in range(total):
+        white, black, kings, turn = index_position(index, pieces)
+        if not _is_valid(white, black, kings):
+            values[index] = INVALID
+            continue
+        board.set_position(white, black, kings, turn)
+        moves = board.generate_legal_moves(turn, mandatory_capture=True)
+        if not moves:
+            push(index, 0)
+            continue
+        internal = 0
+        for move in moves:
+            board.make_move(move)
+            count = (board.white | board.black).bit_count()
+            child = position_index(board.white, board.black, board.kings, board.turn)
+            board.unmake_move()
+            if count == pieces:
+                parents.append(index)
+                children.append(child)
+                internal += 1
+                continue
+            outcome = decode_value(smaller[count][child])
+            if outcome[0] == 'loss':
+                push(index, outcome[1] + 1)
+            elif outcome[0] == 'win':
+                longest_win[index] = max(longest_win[index], outcome[1])
+            else:
+                internal += 1  # a drawn child can never be resolved
+        remaining[index] = internal
+        # A capture into a losing smaller position already decided a win.
+        if not internal and not winning[index]:
+            push(index, longest_win[index] + 1)
+
+    # Predecessor lists in compressed-row form.
+    starts = array('I', bytes(4 * (total + 1)))
+    for child in children:
+        starts[child + 1] += 1
+    for index in range(total):
+        starts[index + 1] += starts[index]
+    fill = array('I', starts)
+    predecessors = array('I', bytes(4 * len(children)))
+    for parent, child in zip(parents, children):
+        predecessors[fill[child]] = parent
+        fill[child] += 1
+    del parents, children, fill
+
+    finalized = bytearray(total)
+    distance = 0
+    while buckets:
+        for index in buckets.pop(distance, ()):
+            if finalized[index] or best[index] != distance:
+                continue
+            if distance + 1 >= INVALID:
+                raise ValueError("Distance does not fit the one-byte format")
+            finalized[index] = 1
+            values[index] = distance + 1
+            for p in range(starts[index], starts[index + 1]):
+                parent = predecessors[p]
+                if finalized[parent]:
+                    continue
+                if distance & 1 == 0:  # the child loses, so the parent wins
+                    push(parent, distance + 1)
+                else:
+                    longest_win[parent] = max(longest_win[parent], distance)
+                    remaining[parent] -= 1
+                    if not remaining[parent]:
+                        push(parent, longest_win[parent] + 1)
+        distance += 1
+    return values
+
+
+def build_tables(max_pieces, progress=None):
+    tables = {}
+    for pieces in range(1, max_pieces + 1):
+        tables[pieces] = solve_table(pieces, tables)
+        if progress is not None:
+            progress(pieces, tables[pieces])
+    return tables
+
+
+def write_tablebase(path, tables, block_size=BLOCK_SIZE):
+    max_pieces = max(tables)
+    blocks, sections = [], []
+    for pieces in range(1, max_pieces + 1):
+        values = tables[pieces]
+        first = len(blocks)
+        for start in range(0, len(values), block_size):
+            blocks.append(zlib.compress(bytes(values[start:start + block_size]), 9))
+        sections.append((len(values), first, len(blocks) - first))
+
+    offset = _header.size + _section.size * max_pieces + _offset.size * (len(blocks) + 1)
+    with open(path, 'wb') as stream:
+        stream.write(_header.pack(MAGIC, VERSION, max_pieces, 0, block_size))
+        for section in sections:
+            stream.write(_section.pack(*section))
+        for block in blocks:
+            stream.write(_offset.pack(offset))
+            offset += len(block)
+        stream.write(_offset.pack(offset))
+        for block in blocks:
+            stream.write(block)
+
+
+class Tablebase:
+    """Constant-time probes into a file written by ``write_tablebase``."""
+
+    def __init__(self, path, cache_blocks=256):
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.max_pieces, _, self.block_size = _header.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} tablebase")
+        self._sections = [_section.unpack_from(self._map, _header.size + _section.size * i)
+                          for i in range(self.max_pieces)]
+        self._offsets_at = _header.size + _section.size * self.max_pieces
+        self._cache = OrderedDict()
+        self.cache_blocks = cache_blocks
+        self.hits = 0
+        self.misses = 0
+
+    def _block(self, number):
+        block = self._cache.get(number)
+        if block is not None:
+            self._cache.move_to_end(number)
+            self.hits += 1
+            return block
+        self.misses += 1
+        start, end = struct.unpack_from('<QQ', self._map, self._offsets_at + _offset.size * number)
+        block = zlib.decompress(self._map[start:end])
+        self._cache[number] = block
+        if len(self._cache) > self.cache_blocks:
+            self._cache.popitem(last=False)
+        return block
+
+    def probe_position(self, white, black, kings, turn):
+        pieces = (white | black).bit_count()
+        if not 1 <= pieces <= self.max_pieces:
+            return None
+        index = position_index(white, black, kings, turn)
+        _, first, _ = self._sections[pieces - 1]
+        block = self._block(first + index // self.block_size)
+        return decode_value(block[index % self.block_size])
+
+    def probe(self, board):
+        """``('win' | 'loss' | 'draw', plies)`` for the side to move, or ``None`` if not covered."""
+        return self.probe_position(board.white, board.black, board.kings, board.turn)
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build endgame tablebases.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build = subparsers.add_parser('build')
+    build.add_argument('--pieces', type=int, default=3)
+    build.add_argument('--output', default='endgame.cktb')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+
+    def progress(pieces, values):
+        counts = {'win': 0, 'loss': 0, 'draw': 0}
+        for value in values:
+            outcome = decode_value(value)
+            if outcome is not None:
+                counts[outcome[0]] += 1
+        print(f"{pieces} pieces: {counts} ({time.perf_counter() - start:.1f}s)")
+
+    write_tablebase(args.output, build_tables(args.pieces, progress))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Batch conversion between positions and NumPy arrays for evaluation and ML.
+
+A batch of positions is held as an ``(N, 4)`` ``uint32`` array of
+``white, black, kings, turn`` (turn 0 for white, 1 for black). Tensors have
+four planes: white men, white kings, black men, black kings. With
+``normalize=True`` they become side-to-move men, side-to-move kings, opponent
+men, opponent kings, and positions with black to move are rotated 180 degrees
+so the side to move always advances towards row 7.
+
+NumPy is an optional dependency, only needed by this module.
+"""
+from bitboard import POSITION_BYTES, square_coordinates
+from game_board import GameBoard
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+CHANNELS = 4
+
+if np is not None:
+    _BITS = np.arange(32, dtype=np.uint32)
+    _ROWS = np.array([square_coordinates(index)[0] for index in range(32)])
+    _COLS = np.array([square_coordinates(index)[1] for index in range(32)])
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("tensor_export requires numpy")
+
+
+def stack_positions(boards):
+    """Collect the masks of ``GameBoard`` objects into an ``(N, 4)`` array."""
+    _require_numpy()
+    return np.array([(board.white, board.black, board.kings, board.turn == 'black') for board in boards],
+                    dtype=np.uint32).reshape(-1, 4)
+
+
+def unpack_positions(buffer):
+    """Decode concatenated ``GameBoard.to_bytes`` records into an ``(N, 4)`` array."""
+    _require_numpy()
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if data.size % POSITION_BYTES:
+        raise ValueError(f"Buffer size is not a multiple of {POSITION_BYTES}")
+    # Little-endian 80-bit values as five 16-bit limbs, most significant first.
+    limbs = data.reshape(-1, POSITION_BYTES // 2, 2).astype(np.uint32)
+    limbs = (limbs[:, :, 0] | limbs[:, :, 1] << 8)[:, ::-1].copy()
+
+    def divide(divisor):
+        remainder = np.zeros(len(limbs), dtype=np.uint32)
+        for i in range(limbs.shape[1]):
+            current = remainder << 16 | limbs[:, i]
+            limbs[:, i] = current // divisor
+            remainder = current % divisor
+        return remainder
+
+    positions = np.zeros((len(limbs), 4), dtype=np.uint32)
+    positions[:, 3] = divide(2)
+    for index in range(32):
+        state = divide(5)
+        bit = np.uint32(1 << index)
+        positions[:, 0] |= np.where(state % 2 == 1, bit, 0).astype(np.uint32)
+        positions[:, 1] |= np.where((state == 2) | (state == 4), bit, 0).astype(np.uint32)
+        positions[:, 2] |= np.where(state > 2, bit, 0).astype(np.uint32)
+    if limbs.any():
+        raise ValueError("Invalid packed position")
+    return positions
+
+
+def _as_positions(positions):
+    if isinstance(positions, (bytes, bytearray, memoryview)):
+        return unpack_positions(positions)
+    if np is not None and isinstance(positions, np.ndarray):
+        return positions.astype(np.uint32).reshape(-1, 4)
+    return stack_positions(positions)
+
+
+def _square_bits(masks):
+    # (N,) masks -> (N, 32) array of 0/1
+    return (masks[:, None] >> _BITS) & 1
+
+
+def positions_to_tensor(positions, layout='planes', dtype=None, normalize=False):
+    """Turn boards, an ``(N, 4)`` array or a packed buffer into a tensor.
+
+    ``layout='planes'`` gives ``(N, 4, 8, 8)``; ``layout='flat'`` gives
+    ``(N, 128)`` with the four planes over the 32 playable squares.
+    """
+    _require_numpy()
+    positions = _as_positions(positions)
+    dtype = np.float32 if dtype is None else dtype
+    white, black, kings, turn = (positions[:, i] for i in range(4))
+
+    planes = np.stack([white & ~kings, white & kings, black & ~kings, black & kings], axis=1)
+    bits = _square_bits(planes.reshape(-1)).reshape(len(positions), CHANNELS, 32)
+    if normalize:
+        flip = turn.astype(bool)
+        # Swap colors and rotate 180 degrees: square i maps to 31 - i.
+        bits[flip] = bits[flip][:, [2, 3, 0, 1], ::-1]
+
+    if layout == 'flat':
+        return bits.reshape(len(positions), CHANNELS * 32).astype(dtype)
+    if layout != 'planes':
+        raise ValueError(f"Unknown layout: {layout!r}")
+    tensor = np.zeros((len(positions), CHANNELS, 8, 8), dtype=dtype)
+    tensor[:, :, _ROWS, _COLS] = bits
+    return tensor
+
+
+def tensor_to_positions(tensor, turns=None, normalized=False):
+    """Inverse of ``positions_to_tensor``.
+
+    ``turns`` (0 white, 1 black per position) defaults to white to move; it is
+    required to undo ``normalize=True``.
+    """
+    _require_numpy()
+    tensor = np.asarray(tensor)
+    count = len(tensor)
+    if tensor.ndim == 4:
+        bits = tensor[:, :, _ROWS, _COLS]
+    else:
+        bits = tensor.reshape(count, CHANNELS, 32)
+    bits = (bits != 0).astype(np.uint32)
+    turns = np.zeros(count, dtype=np.uint32) if turns is None else np.asarray(turns, dtype=np.uint32)
+    if normalized:
+        flip = turns.astype(bool)
+        bits[flip] = bits[flip][:, [2, 3, 0, 1], ::-1]
+
+    masks = (bits << _BITS).sum(axis=2, dtype=np.uint64).astype(np.uint32)
+    positions = np.empty((count, 4), dtype=np.uint32)
+    positions[:, 0] = masks[:, 0] | masks[:, 1]
+    positions[:, 1] = masks[:, 2] | masks[:, 3]
+    positions[:, 2] = masks[:, 1] | masks[:, 3]
+    positions[:, 3] = turns
+    return positions
+
+
+def tensor_to_boards(tensor, turns=None, normalized=False):
+    positions = tensor_to_positions(tensor, turns, normalized)
+    return [GameBoard.from_position((int(white), int(black), int(kings), 'black' if turn else 'white'))
+            for white, black, kings, turn in positions]
@@ -0,0 +1,31 @@
+import unittest
+from bitboard import (square_index, square_coordinates, shift_down_left, shift_down_right,
+                      shift_up_left, shift_up_right, squares_from_mask)
+
+
+class TestBitboard(unittest.TestCase):
+    def test_square_index_round_trip(self):
+        indices = set()
+        for i in range(8):
+            for j in range(8):
+                index = square_index(i, j)
+                if (i + j) % 2 == 0:
+                    self.assertIsNone(index)
+                else:
+                    self.assertEqual(square_coordinates(index), (i, j))
+                    indices.add(index)
+        self.assertEqual(indices, set(range(32)))
+
+    def test_shifts_match_diagonal_geometry(self):
+        shifts = [(shift_down_left, 1, -1), (shift_down_right, 1, 1),
+                  (shift_up_left, -1, -1), (shift_up_right, -1, 1)]
+        for shift, row_step, col_step in shifts:
+            for index in range(32):
+                row, col = square_coordinates(index)
+                expected = square_index(row + row_step, col + col_step)
+                self.assertEqual(squares_from_mask(shift(1 << index)),
+                                 [] if expected is None else [square_coordinates(expected)])
+
+
+if __name__ == '__main__':
+    unittest.main()
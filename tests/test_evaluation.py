@@ -0,0 +1,115 @@
+import random
+import unittest
+from evaluation import EvaluatedBoard, EvaluationWeights, Evaluator
+from game_board import GameBoard, Piece
+from search import SearchEngine
+from self_play import RandomPolicy, play_game
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+WEIGHTS = EvaluationWeights(man=100, king=170, advancement=3, back_rank=7, center=5, mobility=2)
+
+
+def sample_games(count=8):
+    return [play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(seed)).moves
+            for seed in range(count)]
+
+
+class TestEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = Evaluator(WEIGHTS)
+
+    def test_initial_position_is_balanced(self):
+        board = GameBoard()
+        self.assertEqual(self.evaluator.reference(board), 0)
+        self.assertEqual(self.evaluator(board), 0)
+
+    def test_terms(self):
+        board = GameBoard()
+        board.set_position(0, 0)
+        board.squares[3][2].piece = Piece('white')
+        # Man on row 3, in the center, two forward steps.
+        self.assertEqual(self.evaluator.reference(board), 100 + 3 * 3 + 5 + 2 * 2)
+        board.squares[3][2].piece.is_king = True
+        self.assertEqual(self.evaluator.reference(board), 170 + 5 + 2 * 4)
+        board.turn = 'black'
+        self.assertEqual(self.evaluator.reference(board), -(170 + 5 + 2 * 4))
+        board.set_position(0, 0)
+        board.squares[7][0].piece = Piece('black')
+        self.assertEqual(self.evaluator.reference(board), -(100 + 7 + 2))
+
+    def test_fast_path_matches_reference(self):
+        for moves in sample_games():
+            board = GameBoard()
+            for move in moves:
+                board.make_move(move)
+                self.assertEqual(self.evaluator(board), self.evaluator.reference(board))
+
+    def test_incremental_material_on_make_and_unmake(self):
+        for moves in sample_games():
+            board = EvaluatedBoard(self.evaluator)
+            for move in moves:
+                board.make_move(move)
+                self.assertEqual(board.material, self.evaluator.material(board))
+                self.assertEqual(self.evaluator(board), self.evaluator.reference(board))
+            while moves:
+                board.unmake_move()
+                moves = moves[:-1]
+                self.assertEqual(board.material, self.evaluator.material(board))
+
+    def test_incremental_material_through_editing_paths(self):
+        board = EvaluatedBoard(self.evaluator)
+        board.squares[3][2].piece = Piece('black')
+        board.squares[3][2].piece.is_king = True
+        self.assertEqual(board.material, self.evaluator.material(board))
+        board.move_piece([(2, 1), (4, 3)])
+        self.assertEqual(board.material, self.evaluator.material(board))
+        board.set_position(1, 1 << 31, 1)
+        self.assertEqual(board.material, self.evaluator.material(board))
+
+    def test_board_kept_for_another_evaluator(self):
+        board = EvaluatedBoard(Evaluator())
+        board.set_position(0b111, 1 << 20)
+        other = Evaluator(EvaluationWeights(man=50))
+        self.assertEqual(other(board), other.reference(board))
+
+    def test_clone_keeps_material(self):
+        board = EvaluatedBoard(self.evaluator)
+        board.make_move(sample_games(1)[0][0])
+        clone = board.clone()
+        self.assertIsInstance(clone, EvaluatedBoard)
+        self.assertEqual(clone.material, board.material)
+        clone.unmake_move()
+        self.assertEqual(clone.material, self.evaluator.material(GameBoard()))
+        self.assertEqual(board.material, self.evaluator.material(board))
+
+    def test_search_with_evaluator(self):
+        board = EvaluatedBoard(self.evaluator)
+        result = SearchEngine(max_depth=4, evaluate=self.evaluator).search(board)
+        reference = SearchEngine(max_depth=4, evaluate=self.evaluator.reference).search(GameBoard())
+        self.assertEqual((result.move, result.score), (reference.move, reference.score))
+        self.assertEqual(board.position(), GameBoard().position())
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchEvaluation(unittest.TestCase):
+    def test_batch_matches_reference(self):
+        evaluator = Evaluator(WEIGHTS)
+        boards = []
+        for moves in sample_games():
+            board = GameBoard()
+            for move in moves:
+                board.make_move(move)
+                boards.append(GameBoard.from_position(board.position()))
+        scores = evaluator.evaluate_batch(boards)
+        self.assertEqual(scores.dtype, np.int64)
+        self.assertEqual(scores.tolist(), [evaluator.reference(board) for board in boards])
+        packed = b''.join(board.to_bytes() for board in boards)
+        np.testing.assert_array_equal(evaluator.evaluate_batch(packed), scores)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
-from game_board import GameBoard, Square, Piece
+from game_board import GameBoard, Square, Piece, Color, PIECE_VALUES
+from bitboard import square_index, squares_from_mask
+from move import Move
 
 
 class TestGameBoard(unittest.TestCase):
@@ -352,6 +354,193 @@ class TestGameBoard(unittest.TestCase):
         self.assertIsNotNone(self.board.get_piece(5, 2))
         self.assertIsNone(self.board.get_piece(3, 4))
 
+    def test_movable_men(self):
+        self.assertEqual(squares_from_mask(self.board.movable_men('white')),
+                         [(2, 1), (2, 3), (2, 5), (2, 7)])
+        self.assertEqual(squares_from_mask(self.board.movable_men('black')),
+                         [(5, 0), (5, 2), (5, 4), (5, 6)])
+        self.assertEqual(self.board.movable_kings('white'), 0)
+
+    def test_movable_kings_move_backwards(self):
+        self.board.squares[3][4].piece = Piece('white')
+        self.board.squares[3][4].piece.is_king = True
+        self.board.squares[2][3].piece = None
+        self.assertEqual(squares_from_mask(self.board.movable_kings('white')), [(3, 4)])
+
+    def test_capturing_pieces(self):
+        self.assertEqual(self.board.capturing_pieces('white'), 0)
+        self.board.move_piece([(5, 0), (4, 1)])
+        self.board.move_piece([(4, 1), (3, 2)])
+        self.assertEqual(squares_from_mask(self.board.capturing_pieces('white')), [(2, 1), (2, 3)])
+
+    def test_cannot_place_piece_on_white_square(self):
+        with self.assertRaises(ValueError):
+            self.board.squares[3][3].piece = Piece('white')
+
+    def test_generate_initial_moves(self):
+        white_moves = self.board.generate_legal_moves('white')
+        self.assertEqual(len(white_moves), 7)
+        self.assertTrue(all(not move.is_capture for move in white_moves))
+        self.assertIn([(2, 1), (3, 0)], [move.to_coordinates() for move in white_moves])
+        self.assertEqual(len(self.board.generate_legal_moves('black')), 7)
+
+    def test_generate_king_moves_both_ways(self):
+        self.board = GameBoard()
+        self.board.squares[4][3].piece = Piece('white')
+        self.board.squares[4][3].piece.is_king = True
+        moves = [move.to_coordinates() for move in self.board.generate_legal_moves('white')
+                 if move.source == square_index(4, 3)]
+        self.assertCountEqual(moves, [[(4, 3), (3, 2)], [(4, 3), (3, 4)]])
+
+    def test_generate_does_not_mutate_board(self):
+        self.board.squares[3][2].piece = Piece('black')
+        before = self.board.display()
+        self.board.generate_legal_moves('white')
+        self.assertEqual(self.board.display(), before)
+
+    def test_generate_complete_jump_chains(self):
+        self.board.squares[3][2].piece = Piece('black')
+        self.board.squares[6][5].piece = None
+        captures = [move.to_coordinates() for move in self.board.generate_legal_moves('white') if move.is_capture]
+        self.assertCountEqual(captures, [[(2, 1), (4, 3), (6, 5), (4, 7)], [(2, 3), (4, 1)]])
+
+    def test_mandatory_capture(self):
+        self.board.squares[3][2].piece = Piece('black')
+        self.assertGreater(len(self.board.generate_legal_moves('white')), 2)
+        moves = self.board.generate_legal_moves('white', mandatory_capture=True)
+        self.assertEqual(len(moves), 2)
+        self.assertTrue(all(move.is_capture for move in moves))
+
+    def test_generated_moves_are_accepted_by_move_piece(self):
+        self.board.squares[3][2].piece = Piece('black')
+        self.board.squares[6][5].piece = None
+        self.board.squares[4][5].piece = Piece('white')
+        self.board.squares[4][5].piece.is_king = True
+        for color in ('white', 'black'):
+            for move in self.board.generate_legal_moves(color):
+                board = GameBoard()
+                board.set_position(self.board.white, self.board.black, self.board.kings)
+                self.assertTrue(board.move_piece(move.to_coordinates()), move)
+                self.assertEqual(Move.from_coordinates(move.to_coordinates()), move)
+
+    def test_make_and_unmake_move(self):
+        move = self.board.generate_legal_moves('white')[0]
+        before = self.board.display()
+        self.board.make_move(move)
+        self.assertNotEqual(self.board.display(), before)
+        self.assertEqual(self.board.turn, 'black')
+        self.assertEqual(self.board.unmake_move(), move)
+        self.assertEqual(self.board.display(), before)
+        self.assertEqual(self.board.turn, 'white')
+
+    def test_unmake_restores_captured_kings(self):
+        self.board.squares[3][2].piece = Piece('black')
+        self.board.squares[3][2].piece.is_king = True
+        self.board.squares[6][5].piece = None
+        before = (self.board.white, self.board.black, self.board.kings)
+        move = Move.from_coordinates([(2, 1), (4, 3), (6, 5), (4, 7)])
+        self.board.make_move(move)
+        self.assertIsNone(self.board.get_piece(3, 2))
+        self.assertIsNone(self.board.get_piece(5, 6))
+        self.board.unmake_move()
+        self.assertEqual((self.board.white, self.board.black, self.board.kings), before)
+        self.assertTrue(self.board.get_piece(3, 2).is_king)
+
+    def test_unmake_reverts_promotion(self):
+        self.board.squares[7][0].piece = None
+        self.board.squares[6][1].piece = Piece('white')
+        self.board.make_move(Move.from_coordinates([(6, 1), (7, 0)]))
+        self.assertTrue(self.board.get_piece(7, 0).is_king)
+        self.board.unmake_move()
+        self.assertFalse(self.board.get_piece(6, 1).is_king)
+        self.assertIsNone(self.board.get_piece(7, 0))
+
+    def test_make_unmake_sequence_round_trip(self):
+        before = (self.board.white, self.board.black, self.board.kings)
+        played = 0
+        for _ in range(30):
+            moves = self.board.generate_legal_moves(self.board.turn, mandatory_capture=True)
+            if not moves:
+                break
+            self.board.make_move(moves[played % len(moves)])
+            played += 1
+        for _ in range(played):
+            self.board.unmake_move()
+        self.assertEqual((self.board.white, self.board.black, self.board.kings), before)
+
+    def test_colors_are_interned_and_compare_as_strings(self):
+        piece = self.board.get_piece(2, 1)
+        self.assertIs(piece.color, Color.WHITE)
+        self.assertEqual(piece.color, 'white')
+        self.assertEqual(f"{self.board.squares[0][1].color}", 'black')
+        self.assertIs(Piece('black').color, Color.BLACK)
+
+    def test_get_piece_returns_shared_values(self):
+        self.assertIs(self.board.get_piece(2, 1), self.board.get_piece(0, 1))
+        self.assertIs(self.board.get_piece(5, 0), PIECE_VALUES[2])
+        with self.assertRaises(AttributeError):
+            self.board.get_piece(2, 1).is_king = True
+        self.assertFalse(self.board.get_piece(2, 1).is_king)
+
+    def test_square_piece_view_is_reused_and_live(self):
+        square = self.board.squares[2][1]
+        view = square.piece
+        self.assertIs(square.piece, view)
+        view.is_king = True
+        self.assertTrue(self.board.get_piece(2, 1).is_king)
+        square.piece = square.piece
+        self.assertTrue(self.board.get_piece(2, 1).is_king)
+        self.assertTrue(self.board.move_piece([(2, 1), (3, 0)]))
+        self.assertIsNone(square.piece)
+
+    def test_light_squares_are_shared(self):
+        other = GameBoard()
+        self.assertIs(self.board.squares[0][0], other.squares[3][3])
+        self.assertEqual(self.board.squares[0][0].color, 'white')
+        self.assertIsNone(self.board.squares[0][0].piece)
+        self.board.squares[0][0].piece = None
+
+    def test_clone_is_independent(self):
+        self.board.make_move(Move.from_coordinates([(2, 1), (3, 0)]))
+        self.board.squares[5][0].piece.is_king = True
+        clone = self.board.clone()
+        self.assertEqual(clone.position(), self.board.position())
+        self.assertEqual(clone.hash, self.board.hash)
+        self.assertTrue(clone.get_piece(5, 0).is_king)
+
+        self.assertTrue(clone.move_piece([(5, 2), (4, 1)]))
+        clone.squares[0][1].piece = None
+        self.assertIsNotNone(self.board.get_piece(5, 2))
+        self.assertIsNotNone(self.board.get_piece(0, 1))
+        self.assertIsNotNone(self.board.squares[0][1].piece)
+
+        clone.unmake_move()
+        self.assertIsNone(clone.get_piece(3, 0))
+        self.assertEqual(len(self.board._undo_stack), 1)
+
+    def test_snapshot_shares_history_until_a_move(self):
+        self.board.make_move(Move.from_coordinates([(2, 1), (3, 0)]))
+        snapshot = self.board.snapshot()
+        self.assertIs(snapshot._undo_stack, self.board._undo_stack)
+
+        snapshot.make_move(Move.from_coordinates([(5, 2), (4, 1)]))
+        self.assertIsNot(snapshot._undo_stack, self.board._undo_stack)
+        self.assertEqual(len(self.board._undo_stack), 1)
+        self.assertEqual(len(snapshot._undo_stack), 2)
+
+        other = self.board.snapshot()
+        self.board.unmake_move()
+        self.assertEqual(self.board.position(), GameBoard().position())
+        other.unmake_move()
+        self.assertEqual(other.position(), GameBoard().position())
+        snapshot.unmake_move()
+        snapshot.unmake_move()
+        self.assertEqual(snapshot.hash, GameBoard().hash)
+
+    def test_objects_have_no_instance_dict(self):
+        for instance in (self.board, self.board.squares[2][1], self.board.squares[2][1].piece, Piece('white')):
+            self.assertFalse(hasattr(instance, '__dict__'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,110 @@
+import random
+import unittest
+from game_board import GameBoard
+from game_history import GameHistory
+from game_record import decode_record, encode_record
+from perft import parse_diagram
+from self_play import RandomPolicy, play_game
+
+KINGS = (
+    " . . . .",
+    ". . . . ",
+    " . O . .",
+    ". . . . ",
+    " . . . .",
+    ". . . . ",
+    " . . X .",
+    ". . . . ",
+)
+
+
+def random_history(seed=0, checkpoint_interval=4):
+    game = play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(seed))
+    history = GameHistory(checkpoint_interval=checkpoint_interval)
+    positions = [history.board.position()]
+    for move in game.moves:
+        assert history.play(move)
+        positions.append(history.board.position())
+    return history, positions
+
+
+class TestGameHistory(unittest.TestCase):
+    def test_records_only_successful_moves(self):
+        history = GameHistory()
+        self.assertFalse(history.move_piece([(2, 1), (4, 3)]))
+        self.assertFalse(history.move_piece([]))
+        self.assertTrue(history.move_piece([(2, 1), (3, 0)]))
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history.move(0).to_coordinates(), [(2, 1), (3, 0)])
+
+    def test_goto_any_ply(self):
+        history, positions = random_history()
+        order = list(range(len(positions)))
+        random.Random(1).shuffle(order)
+        for ply in order + [0, len(positions) - 1]:
+            history.goto(ply)
+            self.assertEqual(history.board.position(), positions[ply])
+            self.assertEqual(history.board.hash, GameBoard.from_position(positions[ply]).hash)
+        with self.assertRaises(IndexError):
+            history.goto(len(positions))
+
+    def test_repetition_counter_follows_navigation(self):
+        history = GameHistory(parse_diagram(KINGS))
+        shuffle = [[(2, 3), (3, 4)], [(6, 5), (5, 4)], [(3, 4), (2, 3)], [(5, 4), (6, 5)]]
+        for _ in range(2):
+            for move in shuffle:
+                self.assertIsNone(history.draw_reason())
+                self.assertTrue(history.move_piece(move))
+        self.assertEqual(history.repetitions(), 3)
+        self.assertEqual(history.draw_reason(), 'repetition')
+
+        history.undo()
+        self.assertEqual(history.repetitions(), 2)
+        history.goto(0)
+        self.assertEqual(history.repetitions(), 1)
+        history.goto(8)
+        self.assertEqual(history.repetitions(), 3)
+
+    def test_no_progress_rule(self):
+        history = GameHistory(parse_diagram(KINGS), draw_plies=6)
+        moves = [[(2, 3), (3, 4)], [(6, 5), (5, 6)], [(3, 4), (4, 5)], [(5, 6), (4, 7)], [(4, 5), (5, 4)],
+                 [(4, 7), (3, 6)]]
+        for move in moves:
+            self.assertTrue(history.move_piece(move))
+        self.assertEqual(history.quiet_plies, 6)
+        self.assertEqual(history.draw_reason(), 'no progress')
+        history.undo()
+        self.assertIsNone(history.draw_reason())
+
+    def test_man_moves_and_captures_reset_progress(self):
+        history, positions = random_history(seed=20)  # ends in a long king shuffle
+        for ply in range(len(history)):
+            kings_before = positions[ply][2]
+            move = history.move(ply)
+            history.goto(ply + 1)
+            if move.is_capture or not kings_before >> move.source & 1:
+                self.assertEqual(history.quiet_plies, 0)
+            else:
+                self.assertGreater(history.quiet_plies, 0)
+
+    def test_new_move_after_going_back_discards_the_rest(self):
+        history, positions = random_history(seed=3)
+        history.goto(5)
+        replacement = history.board.generate_legal_moves(history.board.turn, mandatory_capture=True)[-1]
+        self.assertTrue(history.play(replacement))
+        self.assertEqual(len(history), 6)
+        self.assertEqual(history.move(5), replacement)
+        self.assertEqual(history.repetitions(), 1)
+        history.goto(2)
+        self.assertEqual(history.board.position(), positions[2])
+
+    def test_record_round_trip(self):
+        history, positions = random_history(seed=5)
+        # encode_record prefixes the payload with its length.
+        copy = GameHistory.from_record(decode_record(encode_record(history.to_record('draw'))[4:]))
+        self.assertEqual(copy.moves(), history.moves())
+        self.assertEqual(copy.board.position(), positions[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
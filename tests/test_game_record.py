@@ -0,0 +1,118 @@
+import os
+import random
+import tempfile
+import unittest
+from bitboard import POSITION_BYTES
+from game_board import GameBoard, Piece
+from game_record import HEADER, GameRecord, GameRecordReader, GameRecordWriter, iter_game_records
+from self_play import RandomPolicy, SelfPlayRunner, play_game, write_game_records
+
+
+class TestPositionBytes(unittest.TestCase):
+    def test_round_trip(self):
+        board = GameBoard()
+        board.squares[3][2].piece = Piece('black')
+        board.squares[3][2].piece.is_king = True
+        board.squares[4][5].piece = Piece('white')
+        board.squares[4][5].piece.is_king = True
+        board.move_piece([(2, 1), (3, 0)])
+        data = board.to_bytes()
+        self.assertEqual(len(data), POSITION_BYTES)
+        copy = GameBoard.from_bytes(data)
+        self.assertEqual(copy.position(), board.position())
+        self.assertEqual(copy.hash, board.hash)
+
+    def test_side_to_move_is_encoded(self):
+        board = GameBoard()
+        other = GameBoard()
+        other.turn = 'black'
+        self.assertNotEqual(board.to_bytes(), other.to_bytes())
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            GameBoard.from_bytes(b'\xff' * POSITION_BYTES)
+
+
+class TestGameRecordFile(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'games.ckgr')
+        self.records = []
+        for seed in range(5):
+            game = play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(seed))
+            self.records.append(GameRecord(game.moves, game.result))
+        board = GameBoard()
+        board.move_piece([(2, 1), (3, 0)])
+        self.records.append(GameRecord([], None, board.position()))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stream_round_trip(self):
+        with GameRecordWriter(self.path) as writer:
+            for record in self.records:
+                writer.write(record)
+        self.assertEqual(list(iter_game_records(self.path)), self.records)
+
+    def test_append_and_random_access(self):
+        with GameRecordWriter(self.path) as writer:
+            writer.write(self.records[0])
+        with GameRecordWriter(self.path) as writer:
+            for record in self.records[1:]:
+                writer.write(record)
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), len(self.records))
+            self.assertEqual(reader[3], self.records[3])
+            self.assertEqual(reader[-1], self.records[-1])
+            self.assertEqual(list(reader), self.records)
+
+    def test_replayed_records_are_legal(self):
+        with GameRecordWriter(self.path) as writer:
+            writer.write(self.records[0])
+        record = next(iter_game_records(self.path))
+        board = GameBoard.from_position(record.start)
+        for move in record.moves:
+            self.assertIn(move, board.generate_legal_moves(board.turn, mandatory_capture=True))
+            board.make_move(move)
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as stream:
+            stream.write(b'not a record file')
+        with self.assertRaises(ValueError):
+            list(iter_game_records(self.path))
+        with self.assertRaises(ValueError):
+            GameRecordReader(self.path)
+
+    def test_rejects_short_headers(self):
+        for data in (b'', b'CKGR', HEADER[:-1]):
+            with open(self.path, 'wb') as stream:
+                stream.write(data)
+            with self.assertRaises(ValueError):
+                list(iter_game_records(self.path))
+            with self.assertRaises(ValueError):
+                GameRecordReader(self.path)
+
+    def test_both_readers_reject_trailing_bytes(self):
+        with GameRecordWriter(self.path) as writer:
+            for record in self.records:
+                writer.write(record)
+        for garbage in (b'\x01', b'\x01\x02', b'\x05\x00\x00\x00\x01'):
+            with open(self.path, 'r+b') as stream:
+                stream.seek(0, os.SEEK_END)
+                end = stream.tell()
+                stream.write(garbage)
+            with self.assertRaises(ValueError):
+                list(iter_game_records(self.path))
+            with self.assertRaises(ValueError):
+                GameRecordReader(self.path)
+            with open(self.path, 'r+b') as stream:
+                stream.truncate(end)
+
+    def test_self_play_binary_writer(self):
+        stats = SelfPlayRunner(workers=1, batch_size=2, writer=write_game_records).run(5, self.path, mode='wb')
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), stats.games)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from game_server import GameServer
+
+
+class TestGameServer(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.server = GameServer(executor=self.executor, idle_timeout=60)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def request(self, **request):
+        return asyncio.run(self.server.handle_line(json.dumps(request)))
+
+    def test_new_game_and_human_move_gets_ai_reply(self):
+        reply = self.request(op='new', ai='black', depth=2, id='a')
+        self.assertTrue(reply['ok'])
+        self.assertEqual(reply['id'], 'a')
+        self.assertEqual(len(reply['moves']), 7)
+        self.assertNotIn('ai_move', reply)
+
+        reply = self.request(op='move', game=reply['game'], move=[[2, 1], [3, 0]])
+        self.assertTrue(reply['ok'], reply)
+        self.assertEqual(reply['plies'], 2)
+        self.assertEqual(reply['position'][3], 'white')
+        self.assertEqual(len(reply['ai_move']), 2)
+
+    def test_ai_playing_white_moves_first(self):
+        reply = self.request(op='new', ai='white', depth=1)
+        self.assertEqual(reply['plies'], 1)
+        self.assertEqual(reply['position'][3], 'black')
+
+    def test_rejected_requests(self):
+        game = self.request(op='new', ai='black', depth=1)['game']
+        for request in [dict(op='move', game=game, move=[[5, 0], [4, 1]]),  # not white's piece
+                        dict(op='move', game=game, move=[[2, 1], [4, 3]]),
+                        dict(op='move', game=game, move=[[2, 2], [3, 3]]),
+                        dict(op='move', game=game, move='nonsense'),
+                        dict(op='move', game=99, move=[[2, 1], [3, 0]]),
+                        dict(op='new', depth=100),
+                        dict(op='fly')]:
+            reply = self.request(**request)
+            self.assertFalse(reply['ok'], request)
+            self.assertIn('error', reply)
+        self.assertFalse(asyncio.run(self.server.handle_line(b'{not json'))['ok'])
+        self.assertEqual(self.request(op='state', game=game)['plies'], 0)
+
+    def test_invalid_fields_reply_with_errors_and_leave_no_game(self):
+        for request in [dict(op='new', ai='white', time_limit='abc'),
+                        dict(op='new', ai='white', time_limit=-1),
+                        dict(op='new', ai='white', time_limit=1e9),
+                        dict(op='state', game=[1]),
+                        dict(op='close', game={'id': 1})]:
+            reply = self.request(**request)
+            self.assertFalse(reply['ok'], request)
+            self.assertIn('error', reply)
+        self.assertEqual(self.server.games, {})
+
+    def test_failed_ai_reply_removes_the_new_game(self):
+        self.server.table_bytes = 'broken'
+        reply = self.request(op='new', ai='white', depth=1)
+        self.assertFalse(reply['ok'])
+        self.assertIn('Internal error', reply['error'])
+        self.assertEqual(self.server.games, {})
+
+    def test_two_player_game_has_no_ai_moves(self):
+        game = self.request(op='new', ai=None)['game']
+        self.request(op='move', game=game, move=[[2, 1], [3, 0]])
+        reply = self.request(op='move', game=game, move=[[5, 2], [4, 3]])
+        self.assertEqual(reply['plies'], 2)
+        self.assertNotIn('ai_move', reply)
+
+    def test_close_and_evict(self):
+        first = self.request(op='new')['game']
+        second = self.request(op='new')['game']
+        self.assertTrue(self.request(op='close', game=first)['ok'])
+        self.assertFalse(self.request(op='state', game=first)['ok'])
+        self.server.games[second].last_active -= 120
+        self.assertEqual(self.server.evict_idle(), 1)
+        self.assertEqual(self.request(op='stats')['games'], 0)
+        self.assertEqual(self.request(op='stats')['evicted'], 1)
+
+    def test_max_games(self):
+        self.server.max_games = 1
+        self.assertTrue(self.request(op='new')['ok'])
+        self.assertFalse(self.request(op='new')['ok'])
+
+    def test_unix_socket_clients(self):
+        async def client(path, moves):
+            reader, writer = await asyncio.open_unix_connection(path)
+
+            async def send(**request):
+                writer.write(json.dumps(request).encode() + b'\n')
+                await writer.drain()
+                return json.loads(await reader.readline())
+
+            reply = await send(op='new', ai='black', depth=1)
+            for _ in range(moves):
+                if reply['winner']:
+                    break
+                reply = await send(op='move', game=reply['game'], move=reply['moves'][0])
+                self.assertTrue(reply['ok'], reply)
+            writer.close()
+            return reply
+
+        async def run():
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, 'server.sock')
+                await self.server.start(path=path)
+                try:
+                    return await asyncio.gather(*[client(path, 3) for _ in range(5)])
+                finally:
+                    await self.server.close()
+
+        replies = asyncio.run(run())
+        self.assertEqual(len({reply['game'] for reply in replies}), 5)
+        self.assertEqual(self.server.stats['created'], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
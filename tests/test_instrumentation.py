@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+from game_board import GameBoard, Piece
+from instrumentation import Instrumentation
+from search import SearchEngine
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_methods_are_restored(self):
+        original = GameBoard.__dict__['move_piece']
+        with Instrumentation() as profiler:
+            self.assertTrue(profiler.installed)
+            self.assertIsNot(GameBoard.__dict__['move_piece'], original)
+        self.assertFalse(profiler.installed)
+        self.assertIs(GameBoard.__dict__['move_piece'], original)
+
+    def test_only_one_installed(self):
+        with Instrumentation():
+            with self.assertRaises(RuntimeError):
+                Instrumentation().install()
+
+    def test_counts_moves_captures_and_promotions(self):
+        board = GameBoard()
+        with Instrumentation() as profiler:
+            self.assertFalse(board.move_piece([(2, 1), (4, 3)]))
+            board.move_piece([(2, 1), (3, 2)])
+            board.move_piece([(5, 4), (4, 3)])
+            board.move_piece([(3, 2), (5, 4)])
+
+            promotion = GameBoard()
+            promotion.set_position(0, 0)
+            promotion.squares[6][1].piece = Piece('white')
+            promotion.move_piece(moves=[(6, 1), (7, 2)])
+
+        counters = profiler.snapshot()['counters']
+        self.assertEqual(counters, {'failed_moves': 1, 'capture_moves': 1, 'captures': 1, 'promotions': 1})
+        stats = profiler.snapshot()['operations']['GameBoard.move_piece']
+        self.assertEqual(stats['calls'], 5)
+        self.assertEqual(sum(stats['histogram'].values()), 5)
+        self.assertLessEqual(stats['p50_ns'], stats['p99_ns'])
+
+    def test_failing_calls_behave_as_without_instrumentation(self):
+        board = GameBoard()
+        with Instrumentation() as profiler:
+            for _ in range(2):
+                with self.assertRaises(TypeError):
+                    board.move_piece()
+            self.assertTrue(board.move_piece(moves=[(2, 1), (3, 0)]))
+            board.make_move(move=board.generate_legal_moves('black')[0])
+        self.assertEqual(profiler._stack, [])
+        self.assertEqual(set(profiler.folded), {'GameBoard.move_piece', 'GameBoard.make_move',
+                                                'GameBoard.generate_legal_moves'})
+
+    def test_search_profile_and_folded_export(self):
+        with Instrumentation() as profiler:
+            result = SearchEngine(max_depth=3).search(GameBoard())
+        operations = profiler.snapshot()['operations']
+        self.assertEqual(operations['GameBoard.make_move']['calls'], operations['GameBoard.unmake_move']['calls'])
+        self.assertEqual(operations['SearchEngine._negamax']['calls'], result.nodes)
+        total = sum(stats['self_ns'] for stats in operations.values())
+        self.assertEqual(total, operations['SearchEngine.search']['total_ns'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'search.folded')
+            profiler.write_folded(path, unit_ns=1)
+            with open(path) as stream:
+                lines = stream.read().splitlines()
+        stacks = dict(line.rsplit(' ', 1) for line in lines)
+        self.assertIn('SearchEngine.search;SearchEngine._negamax;GameBoard.make_move', stacks)
+        self.assertTrue(all(stack.startswith('SearchEngine.search') for stack in stacks))
+        self.assertNotIn('SearchEngine._negamax;SearchEngine._negamax', ''.join(stacks))
+
+    def test_reset(self):
+        with Instrumentation() as profiler:
+            GameBoard().move_piece([(2, 1), (4, 3)])
+            profiler.reset()
+            GameBoard().move_piece([(2, 1), (3, 2)])
+        self.assertEqual(profiler.snapshot()['counters']['failed_moves'], 0)
+        self.assertEqual(profiler.snapshot()['operations']['GameBoard.move_piece']['calls'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from game_board import GameBoard
+from mcts import MCTSEngine, material_prior
+from perft import parse_diagram
+from self_play import GreedyPolicy
+
+# White wins at once by taking the last black piece, if it sees the capture.
+LAST_PIECE = (
+    " . . . .",
+    ". . . . ",
+    " . o . .",
+    ". . x . ",
+    " . . . .",
+    ". . . . ",
+    " . . . .",
+    "O . . . ",
+)
+
+
+class TestMCTS(unittest.TestCase):
+    def test_arena_invariants(self):
+        engine = MCTSEngine(iterations=300, batch_size=8)
+        result = engine.search(GameBoard())
+        self.assertEqual(result.playouts, 300)
+        self.assertEqual(engine.visits[0], 300)
+        self.assertEqual(sum(visits for _, visits, _ in result.children), 300)
+        self.assertEqual(len(result.children), 7)
+        self.assertEqual(result.tree_nodes, len(engine))
+        for node in range(1, len(engine)):
+            parent = engine.parent[node]
+            first = engine.first_child[parent]
+            self.assertTrue(first <= node < first + engine.child_count[parent])
+        self.assertGreater(result.playouts_per_second, 0)
+
+    def test_finds_winning_capture(self):
+        for mode, prior in [('uct', None), ('puct', material_prior)]:
+            board = parse_diagram(LAST_PIECE)
+            engine = MCTSEngine(iterations=200, mode=mode, prior=prior, mandatory_capture=False)
+            result = engine.search(board)
+            self.assertEqual(result.move.to_coordinates(), [(2, 3), (4, 5)], mode)
+            self.assertGreater(result.value, 0.9)
+            self.assertEqual(board.position(), parse_diagram(LAST_PIECE).position())
+
+    def test_tree_is_reused_after_two_plies(self):
+        engine = MCTSEngine(iterations=400, batch_size=4)
+        board = GameBoard()
+        first = engine.search(board)
+        board.make_move(first.move)
+        reply = max(engine._children(_child_of(engine, first.move)), key=lambda node: engine.visits[node])
+        board.make_move(engine.moves[reply])
+        kept = engine.visits[reply]
+        result = engine.search(board, iterations=0)
+        self.assertGreater(kept, 0)
+        self.assertEqual(engine.visits[0], kept)
+        self.assertEqual(result.playouts, 0)
+        self.assertIsNotNone(result.move)
+
+        engine.search(GameBoard(), iterations=10)
+        self.assertEqual(engine.visits[0], 10)
+
+    def test_no_moves(self):
+        board = GameBoard()
+        board.set_position(0, 1)
+        result = MCTSEngine(iterations=10).search(board)
+        self.assertIsNone(result.move)
+
+    def test_greedy_playouts_in_worker_processes(self):
+        with MCTSEngine(iterations=64, batch_size=16, workers=2, rollout_policy=GreedyPolicy()) as engine:
+            result = engine.search(GameBoard())
+        self.assertEqual(result.playouts, 64)
+        self.assertIn(result.move, GameBoard().generate_legal_moves('white', mandatory_capture=True))
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            MCTSEngine(mode='alpha-zero')
+
+
+def _child_of(engine, move):
+    return next(child for child in engine._children(0) if engine.moves[child] == move)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from bitboard import square_coordinates, square_index
+from move_tables import (ADJACENT_COORDINATES, JUMP_MIDDLE, JUMPS, KING_STEPS, MAN_STEPS, SQUARE_INDEX,
+                         STEP_ROW_DIRECTION, index_of)
+
+
+class TestMoveTables(unittest.TestCase):
+    def test_square_index_table(self):
+        for row in range(-1, 9):
+            for col in range(-1, 9):
+                self.assertEqual(index_of(row, col), square_index(row, col))
+        self.assertEqual(len(SQUARE_INDEX), 64)
+
+    def test_step_tables_match_geometry(self):
+        for index in range(32):
+            row, col = square_coordinates(index)
+            for target in range(32):
+                target_row, target_col = square_coordinates(target)
+                pair = index * 32 + target
+                if abs(target_row - row) == 1 and abs(target_col - col) == 1:
+                    self.assertEqual(STEP_ROW_DIRECTION[pair], target_row - row)
+                else:
+                    self.assertEqual(STEP_ROW_DIRECTION[pair], 0)
+                if abs(target_row - row) == 2 and abs(target_col - col) == 2:
+                    middle = square_index((row + target_row) // 2, (col + target_col) // 2)
+                    self.assertEqual(JUMP_MIDDLE[pair], middle)
+                    self.assertIn((1 << middle, target), JUMPS[index])
+                else:
+                    self.assertEqual(JUMP_MIDDLE[pair], -1)
+
+    def test_step_targets(self):
+        self.assertEqual(MAN_STEPS['white'][square_index(2, 1)], (square_index(3, 0), square_index(3, 2)))
+        self.assertEqual(MAN_STEPS['black'][square_index(5, 0)], (square_index(4, 1),))
+        self.assertEqual(len(KING_STEPS[square_index(3, 2)]), 4)
+        self.assertEqual(len(JUMPS[square_index(3, 2)]), 4)
+        self.assertEqual(len(JUMPS[square_index(0, 1)]), 1)
+
+    def test_adjacent_coordinates(self):
+        self.assertEqual(ADJACENT_COORDINATES[0], ((1, 0), (0, 1)))
+        self.assertEqual(len(ADJACENT_COORDINATES[3 * 8 + 3]), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import pickle
+import random
+import tempfile
+import unittest
+from game_board import GameBoard
+from game_record import GameRecord, GameRecordWriter, iter_game_records
+from move import Move
+from opening_book import BookPolicy, OpeningBook, build_book, write_book
+from self_play import RandomPolicy, play_game
+
+
+class TestOpeningBook(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'book.ckob')
+        self.opening = Move.from_coordinates([(2, 1), (3, 0)])
+        reply = Move.from_coordinates([(5, 2), (4, 3)])
+        other = Move.from_coordinates([(2, 3), (3, 4)])
+        self.records = [GameRecord([self.opening, reply], 'white'),
+                        GameRecord([self.opening, reply], 'black'),
+                        GameRecord([self.opening], 'draw'),
+                        GameRecord([other], 'white')]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def open_book(self, records, max_ply=16, **kwargs):
+        write_book(self.path, build_book(records, max_ply), max_ply)
+        return OpeningBook(self.path, **kwargs)
+
+    def test_aggregates_games_per_position(self):
+        with self.open_book(self.records) as book:
+            entries = book.entries(GameBoard())
+            self.assertEqual([entry.move for entry in entries],
+                             [self.opening, Move.from_coordinates([(2, 3), (3, 4)])])
+            self.assertEqual((entries[0].games, entries[0].points, entries[0].ply), (3, 3, 0))
+            self.assertEqual(entries[1].score, 1.0)
+
+            board = GameBoard()
+            board.make_move(self.opening)
+            (reply,) = book.entries(board)
+            self.assertEqual((reply.games, reply.points, reply.ply), (2, 2, 1))
+
+    def test_out_of_book(self):
+        board = GameBoard()
+        board.move_piece([(2, 5), (3, 6)])
+        with self.open_book(self.records) as book:
+            self.assertEqual(book.entries(board), [])
+            self.assertIsNone(book.choose(board))
+
+    def test_depth_cutoff(self):
+        board = GameBoard()
+        board.make_move(self.opening)
+        with self.open_book(self.records, max_ply=1) as book:
+            self.assertEqual(book.entries(board), [])
+            self.assertTrue(book.entries(GameBoard()))
+        with self.open_book(self.records, max_ply=2) as book:
+            self.assertTrue(book.entries(board))
+
+    def test_read_time_cutoff_and_min_games(self):
+        write_book(self.path, build_book(self.records))
+        board = GameBoard()
+        board.make_move(self.opening)
+        with OpeningBook(self.path, max_ply=1) as book:
+            self.assertEqual(book.entries(board), [])
+        with OpeningBook(self.path, min_games=2) as book:
+            self.assertEqual([entry.move for entry in book.entries(GameBoard())], [self.opening])
+
+    def test_weighted_choice(self):
+        rng = random.Random(0)
+        with self.open_book(self.records) as book:
+            picks = [book.choose(GameBoard(), rng) for _ in range(400)]
+            self.assertGreater(picks.count(self.opening), 200)
+            self.assertLess(picks.count(self.opening), 400)
+            self.assertNotEqual(book.choose(GameBoard(), weight='best'), self.opening)
+            with self.assertRaises(ValueError):
+                book.choose(GameBoard(), weight='nope')
+
+    def test_book_from_game_records(self):
+        records_path = os.path.join(self.directory.name, 'games.ckgr')
+        with GameRecordWriter(records_path) as writer:
+            for seed in range(20):
+                game = play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(seed))
+                writer.write(GameRecord(game.moves, game.result))
+        with self.open_book(iter_game_records(records_path), max_ply=8) as book:
+            self.assertEqual(sum(entry.games for entry in book.entries(GameBoard())), 20)
+            for record in iter_game_records(records_path):
+                board = GameBoard()
+                for move in record.moves[:8]:
+                    self.assertIn(move, [entry.move for entry in book.entries(board)])
+                    board.make_move(move)
+
+    def test_policy_falls_back_out_of_book(self):
+        write_book(self.path, build_book(self.records))
+        policy = pickle.loads(pickle.dumps(BookPolicy(self.path, RandomPolicy())))
+        game = play_game(GameBoard(), policy, policy, random.Random(1), max_plies=10)
+        self.assertIn(game.moves[0], [self.opening, Move.from_coordinates([(2, 3), (3, 4)])])
+        self.assertEqual(len(game.moves), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
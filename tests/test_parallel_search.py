@@ -0,0 +1,60 @@
+import unittest
+from game_board import GameBoard
+from parallel_search import ParallelSearchEngine
+from search import SearchEngine
+
+
+class TestParallelSearch(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = ParallelSearchEngine(workers=2, transposition_table_bytes=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.engine.close()
+
+    def test_position_round_trip(self):
+        board = GameBoard()
+        board.move_piece([(2, 1), (3, 2)])
+        copy = GameBoard.from_position(board.position())
+        self.assertEqual(copy.display(), board.display())
+        self.assertEqual(copy.turn, 'black')
+        self.assertEqual(copy.hash, board.hash)
+
+    def test_matches_serial_score(self):
+        board = GameBoard()
+        board.move_piece([(2, 1), (3, 0)])
+        board.move_piece([(5, 4), (4, 5)])
+        serial = SearchEngine(max_depth=4).search(board)
+        parallel = self.engine.search(board, max_depth=4)
+        self.assertEqual(parallel.depth, 4)
+        self.assertEqual(parallel.score, serial.score)
+        self.assertIn(parallel.move, board.generate_legal_moves(board.turn))
+        self.assertGreater(parallel.nodes, 0)
+
+    def test_result_is_deterministic(self):
+        board = GameBoard()
+        first = self.engine.search(board, max_depth=3)
+        second = self.engine.search(board, max_depth=3)
+        self.assertEqual((first.move, first.score), (second.move, second.score))
+
+    def test_board_is_not_modified(self):
+        board = GameBoard()
+        before = board.position()
+        self.engine.search(board, max_depth=2)
+        self.assertEqual(board.position(), before)
+
+    def test_merge_reports_depth_zero_when_a_share_finished_nothing(self):
+        root_moves = GameBoard().generate_legal_moves('white')
+        searched = [(depth, (root_moves[1].path, root_moves[1].captured), 10) for depth in (1, 2, 3)]
+        self.assertEqual(ParallelSearchEngine._merge(root_moves, [searched, []]), (root_moves[0], None, 0))
+        self.assertEqual(ParallelSearchEngine._merge(root_moves, [searched])[1:], (10, 3))
+
+    def test_budget_exhausted_before_depth_one_is_not_a_mate_score(self):
+        result = self.engine.search(GameBoard(), node_limit=2)
+        self.assertEqual(result.depth, 0)
+        self.assertEqual(result.score, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from game_board import GameBoard
+from perft import PERFT_POSITIONS, divide, parse_diagram, perft, timed_perft
+
+
+def reference_moves(board):
+    # Candidate coordinate sequences validated by move_piece alone.
+    color = board.turn
+    pieces = [(i, j) for i in range(8) for j in range(8)
+              if board.get_piece(i, j) is not None and board.get_piece(i, j).color == color]
+    captures = []
+
+    def extend(sequence):
+        extended = False
+        row, col = sequence[-1]
+        for i, j in [(-2, -2), (-2, 2), (2, -2), (2, 2)]:
+            candidate = sequence + [(row + i, col + j)]
+            if GameBoard.from_position(board.position()).move_piece(candidate):
+                extended = True
+                extend(candidate)
+        if not extended and len(sequence) > 1:
+            captures.append(sequence)
+
+    for square in pieces:
+        extend([square])
+    if captures:
+        return captures
+    simple = []
+    for row, col in pieces:
+        for i, j in [(-1, -1), (-1, 1), (1, -1), (1, 1)]:
+            candidate = [(row, col), (row + i, col + j)]
+            if GameBoard.from_position(board.position()).move_piece(candidate):
+                simple.append(candidate)
+    return simple
+
+
+def reference_perft(board, depth):
+    if depth == 0:
+        return 1
+    nodes = 0
+    for sequence in reference_moves(board):
+        child = GameBoard.from_position(board.position())
+        child.move_piece(sequence)
+        nodes += reference_perft(child, depth - 1)
+    return nodes
+
+
+class TestPerft(unittest.TestCase):
+    def test_reference_counts(self):
+        for name, (diagram, turn, expected) in PERFT_POSITIONS.items():
+            for depth, nodes in expected.items():
+                if depth <= 5:
+                    with self.subTest(position=name, depth=depth):
+                        self.assertEqual(perft(parse_diagram(diagram, turn), depth), nodes)
+
+    def test_generator_matches_move_piece(self):
+        for name, (diagram, turn, expected) in PERFT_POSITIONS.items():
+            board = parse_diagram(diagram, turn)
+            depth = 3 if name == 'initial' else 4
+            with self.subTest(position=name):
+                self.assertEqual(reference_perft(board, depth), expected[depth])
+
+    def test_divide_sums_to_perft(self):
+        board = parse_diagram(*PERFT_POSITIONS['capture_chains'][:2])
+        counts = divide(board, 3)
+        self.assertEqual(sum(counts.values()), perft(board, 3))
+
+    def test_perft_leaves_board_untouched(self):
+        board = GameBoard()
+        before = board.position(), board.hash
+        nodes, elapsed, nps = timed_perft(board, 4)
+        self.assertEqual((board.position(), board.hash), before)
+        self.assertEqual(nodes, 1469)
+        self.assertGreater(nps, 0)
+
+    def test_parse_diagram_matches_initial_board(self):
+        board = parse_diagram(PERFT_POSITIONS['initial'][0])
+        self.assertEqual(board.position(), GameBoard().position())
+
+
+if __name__ == '__main__':
+    unittest.main()
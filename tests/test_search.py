@@ -0,0 +1,71 @@
+import unittest
+from game_board import GameBoard, Piece
+from move import Move
+from search import SearchEngine, evaluate, MATE_SCORE
+
+
+def empty_board():
+    board = GameBoard()
+    board.set_position(0, 0)
+    return board
+
+
+class TestSearch(unittest.TestCase):
+    def test_evaluate_initial_position_is_balanced(self):
+        self.assertEqual(evaluate(GameBoard()), 0)
+
+    def test_search_returns_legal_move_and_stats(self):
+        board = GameBoard()
+        result = SearchEngine(max_depth=4).search(board)
+        self.assertIn(result.move, board.generate_legal_moves('white'))
+        self.assertEqual(result.depth, 4)
+        self.assertGreater(result.nodes, 0)
+        self.assertGreater(result.nodes_per_second, 0)
+
+    def test_search_leaves_board_untouched(self):
+        board = GameBoard()
+        before = board.display()
+        SearchEngine(node_limit=2000).search(board)
+        self.assertEqual(board.display(), before)
+        self.assertEqual(board.turn, 'white')
+        self.assertEqual(board._undo_stack, [])
+
+    def test_node_budget_stops_search(self):
+        result = SearchEngine(max_depth=50, node_limit=5000).search(GameBoard())
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.depth, 50)
+        self.assertLessEqual(result.nodes, 5000)
+
+    def test_budget_exhausted_before_depth_one_is_not_a_mate_score(self):
+        board = GameBoard()
+        result = SearchEngine(node_limit=1).search(board)
+        self.assertEqual(result.depth, 0)
+        self.assertEqual(result.score, evaluate(board))
+        self.assertIn(result.move, board.generate_legal_moves('white'))
+
+    def test_time_budget_stops_search(self):
+        result = SearchEngine(max_depth=50, time_limit=0.2).search(GameBoard())
+        self.assertIsNotNone(result.move)
+        self.assertLess(result.elapsed, 1.0)
+
+    def test_prefers_double_jump(self):
+        board = empty_board()
+        board.squares[2][1].piece = Piece('white')
+        board.squares[3][2].piece = Piece('black')
+        board.squares[5][4].piece = Piece('black')
+        board.squares[6][7].piece = Piece('black')
+        result = SearchEngine(max_depth=3, mandatory_capture=False).search(board)
+        self.assertEqual(result.move, Move.from_coordinates([(2, 1), (4, 3), (6, 5)]))
+
+    def test_finds_win_when_opponent_has_no_piece_left(self):
+        board = empty_board()
+        board.squares[2][1].piece = Piece('white')
+        board.squares[3][2].piece = Piece('black')
+        board.squares[0][7].piece = Piece('white')
+        result = SearchEngine(max_depth=5, mandatory_capture=False).search(board)
+        self.assertEqual(result.move, Move.from_coordinates([(2, 1), (4, 3)]))
+        self.assertGreater(result.score, MATE_SCORE - 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
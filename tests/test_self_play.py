@@ -0,0 +1,74 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from game_board import GameBoard
+from self_play import GreedyPolicy, RandomPolicy, SearchPolicy, SelfPlayRunner, play_game
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_play_game_reaches_an_end(self):
+        board = GameBoard()
+        game = play_game(board, RandomPolicy(), RandomPolicy(), random.Random(1))
+        self.assertIn(game.result, ('white', 'black', 'draw'))
+        self.assertGreater(game.plies, 0)
+        if game.reason == 'no moves':
+            self.assertEqual(board.generate_legal_moves(board.turn, mandatory_capture=True), [])
+
+    def test_replayed_moves_are_legal(self):
+        game = play_game(GameBoard(), GreedyPolicy(), RandomPolicy(), random.Random(3))
+        board = GameBoard()
+        for move in game.moves:
+            self.assertIn(move, board.generate_legal_moves(board.turn, mandatory_capture=True))
+            board.make_move(move)
+
+    def test_draw_rule(self):
+        game = play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(0), draw_plies=0)
+        self.assertEqual((game.result, game.reason, game.plies), ('draw', 'no progress', 0))
+        game = play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(0), max_plies=5)
+        self.assertEqual((game.result, game.reason, game.plies), ('draw', 'max plies', 5))
+
+    def test_search_policy(self):
+        game = play_game(GameBoard(), SearchPolicy(max_depth=2), RandomPolicy(), random.Random(0), max_plies=20)
+        self.assertLessEqual(game.plies, 20)
+
+    def test_runner_streams_games_and_reports_throughput(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.jsonl')
+            stats = SelfPlayRunner(workers=1, batch_size=3, seed=7).run(10, path)
+            with open(path) as stream:
+                records = [json.loads(line) for line in stream]
+        self.assertEqual(stats.games, 10)
+        self.assertEqual(sorted(record['index'] for record in records), list(range(10)))
+        self.assertEqual(sum(stats.results.values()), 10)
+        self.assertEqual(stats.positions, sum(len(record['moves']) + 1 for record in records))
+        self.assertGreater(stats.games_per_second, 0)
+        self.assertGreater(stats.positions_per_second, 0)
+
+    def test_results_do_not_depend_on_worker_count(self):
+        serial = SelfPlayRunner(workers=1, batch_size=4, seed=2)
+        parallel = SelfPlayRunner(workers=2, batch_size=4, seed=2)
+        self.assertEqual(serial.run(8).results, parallel.run(8).results)
+
+    def test_parallel_run_keeps_a_bounded_window_of_batches(self):
+        runner = SelfPlayRunner(workers=2, batch_size=1, seed=2)
+        dealt = []
+        batches = runner._batches
+
+        def counted(games):
+            for batch in batches(games):
+                dealt.append(batch[0])
+                yield batch
+
+        runner._batches = counted
+        played = []
+        for batch in runner._run_batches(12):
+            # Four batches in flight plus at most four finished ones waiting for the writer.
+            self.assertLessEqual(len(dealt) - len(played), 8)
+            played.append(batch)
+        self.assertEqual(sorted(game.index for batch in played for game in batch), list(range(12)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import random
+import tempfile
+import unittest
+from game_board import GameBoard
+from search import SearchEngine, MATE_SCORE
+from tablebase import (INVALID, Tablebase, build_tables, decode_value, index_position, position_index,
+                       table_size, write_tablebase)
+
+
+def child_outcomes(tables, white, black, kings, turn):
+    board = GameBoard()
+    board.set_position(white, black, kings, turn)
+    outcomes = []
+    for move in board.generate_legal_moves(turn, mandatory_capture=True):
+        board.make_move(move)
+        pieces = (board.white | board.black).bit_count()
+        index = position_index(board.white, board.black, board.kings, board.turn)
+        outcomes.append(decode_value(tables[pieces][index]))
+        board.unmake_move()
+    return outcomes
+
+
+class TestTablebase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tables = build_tables(2)
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, 'endgame.cktb')
+        write_tablebase(cls.path, cls.tables, block_size=512)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_index_round_trip(self):
+        for pieces in (1, 2, 3):
+            rng = random.Random(pieces)
+            for index in [0, table_size(pieces) - 1] + [rng.randrange(table_size(pieces)) for _ in range(200)]:
+                self.assertEqual(position_index(*index_position(index, pieces)), index)
+
+    def test_values_agree_with_children(self):
+        for pieces, values in self.tables.items():
+            for index in range(len(values)):
+                self.assert_agrees_with_children(self.tables, pieces, index)
+
+    def assert_agrees_with_children(self, tables, pieces, index):
+        outcome = decode_value(tables[pieces][index])
+        if outcome is None:
+            return
+        children = child_outcomes(tables, *index_position(index, pieces))
+        losses = [distance for result, distance in children if result == 'loss']
+        if outcome[0] == 'win':
+            self.assertEqual(outcome[1], min(losses) + 1, index)
+        elif outcome[0] == 'loss':
+            self.assertFalse(losses)
+            self.assertTrue(all(result == 'win' for result, _ in children))
+            self.assertEqual(outcome[1], max([distance + 1 for _, distance in children], default=0))
+        else:
+            self.assertFalse(losses)
+            self.assertTrue(any(result == 'draw' for result, _ in children))
+
+    def test_three_piece_values_agree_with_children(self):
+        # Captures from three pieces reach two-piece positions that are not all lost.
+        tables = build_tables(3)
+        rng = random.Random(3)
+        for index in rng.sample(range(table_size(3)), 5000):
+            self.assert_agrees_with_children(tables, 3, index)
+
+    def test_single_piece_wins(self):
+        board = GameBoard()
+        board.set_position(1 << 13, 0)
+        self.assertEqual(decode_value(self.tables[1][position_index(board.white, 0, 0, 'white')]), ('win', 1))
+        self.assertEqual(decode_value(self.tables[1][position_index(board.white, 0, 0, 'black')]), ('loss', 0))
+
+    def test_invalid_positions_are_marked(self):
+        man_on_last_row = 1 << 30
+        self.assertEqual(self.tables[1][position_index(man_on_last_row, 0, 0, 'white')], INVALID)
+
+    def test_probe_matches_tables(self):
+        with Tablebase(self.path, cache_blocks=4) as tablebase:
+            self.assertEqual(tablebase.max_pieces, 2)
+            rng = random.Random(0)
+            for _ in range(300):
+                pieces = rng.choice((1, 2))
+                index = rng.randrange(table_size(pieces))
+                white, black, kings, turn = index_position(index, pieces)
+                self.assertEqual(tablebase.probe_position(white, black, kings, turn),
+                                 decode_value(self.tables[pieces][index]))
+            self.assertIsNone(tablebase.probe(GameBoard()))
+            self.assertGreater(tablebase.hits, 0)
+            self.assertLessEqual(len(tablebase._cache), 4)
+
+    def test_search_uses_tablebase(self):
+        board = GameBoard()
+        # White king against a lone black man: find a position the table calls a win.
+        for index, value in enumerate(self.tables[2]):
+            outcome = decode_value(value)
+            white, black, kings, turn = index_position(index, 2)
+            if outcome and outcome[0] == 'win' and outcome[1] >= 3 and turn == 'white' and white and black:
+                break
+        board.set_position(white, black, kings, turn)
+        with Tablebase(self.path) as tablebase:
+            result = SearchEngine(max_depth=2, tablebase=tablebase).search(board)
+        self.assertEqual(result.score, MATE_SCORE - outcome[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+from game_board import GameBoard, Piece
+from self_play import RandomPolicy, play_game
+
+try:
+    import numpy as np
+    from tensor_export import (positions_to_tensor, stack_positions, tensor_to_boards, tensor_to_positions,
+                               unpack_positions)
+except ImportError:
+    np = None
+
+
+def sample_boards():
+    boards = [GameBoard()]
+    game = play_game(GameBoard(), RandomPolicy(), RandomPolicy(), random.Random(4))
+    board = GameBoard()
+    for move in game.moves:
+        board.make_move(move)
+        boards.append(GameBoard.from_position(board.position()))
+    return boards
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestTensorExport(unittest.TestCase):
+    def setUp(self):
+        self.boards = sample_boards()
+
+    def test_planes_match_squares(self):
+        board = GameBoard()
+        board.squares[3][2].piece = Piece('black')
+        board.squares[3][2].piece.is_king = True
+        tensor = positions_to_tensor([board])
+        self.assertEqual(tensor.shape, (1, 4, 8, 8))
+        self.assertEqual(tensor.dtype, np.float32)
+        for i in range(8):
+            for j in range(8):
+                piece = board.get_piece(i, j)
+                expected = [0, 0, 0, 0]
+                if piece is not None:
+                    expected[(2 if piece.color == 'black' else 0) + piece.is_king] = 1
+                self.assertEqual(list(tensor[0, :, i, j]), expected)
+
+    def test_flat_layout(self):
+        tensor = positions_to_tensor(self.boards, layout='flat', dtype=np.uint8)
+        self.assertEqual(tensor.shape, (len(self.boards), 128))
+        self.assertEqual(int(tensor[0].sum()), 24)
+
+    def test_packed_buffer_matches_boards(self):
+        buffer = b''.join(board.to_bytes() for board in self.boards)
+        np.testing.assert_array_equal(unpack_positions(buffer), stack_positions(self.boards))
+        np.testing.assert_array_equal(positions_to_tensor(buffer), positions_to_tensor(self.boards))
+
+    def test_normalize_to_side_to_move(self):
+        board = GameBoard()
+        board.turn = 'black'
+        tensor = positions_to_tensor([GameBoard(), board], normalize=True)
+        # The initial position is symmetric, so both sides see the same planes.
+        np.testing.assert_array_equal(tensor[0], tensor[1])
+        board.move_piece([(5, 0), (4, 1)])
+        board.turn = 'black'
+        tensor = positions_to_tensor([board], normalize=True)
+        self.assertEqual(tensor[0, 0, 3, 6], 1)
+
+    def test_round_trip_to_boards(self):
+        positions = stack_positions(self.boards)
+        for normalize in (False, True):
+            tensor = positions_to_tensor(positions, normalize=normalize)
+            np.testing.assert_array_equal(tensor_to_positions(tensor, positions[:, 3], normalize), positions)
+        rebuilt = tensor_to_boards(positions_to_tensor(positions, layout='flat'), positions[:, 3])
+        self.assertEqual([board.position() for board in rebuilt], [board.position() for board in self.boards])
+        self.assertEqual([board.hash for board in rebuilt], [board.hash for board in self.boards])
+
+
+if __name__ == '__main__':
+    unittest.main()
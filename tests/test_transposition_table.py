@@ -0,0 +1,70 @@
+import unittest
+from game_board import GameBoard
+from search import SearchEngine
+from transposition_table import TranspositionTable, worker_table, EXACT, LOWER_BOUND, UPPER_BOUND
+
+
+class TestTranspositionTable(unittest.TestCase):
+    def setUp(self):
+        self.table = TranspositionTable(memory_bytes=1024)
+
+    def test_memory_cap(self):
+        self.assertLessEqual(self.table.memory_bytes, 1024)
+        self.assertEqual(self.table.capacity, 64)
+        self.assertLessEqual(TranspositionTable(memory_bytes=1000).memory_bytes, 1000)
+
+    def test_store_and_probe(self):
+        self.table.store(12345, 4, EXACT, -250, 37)
+        self.assertEqual(self.table.probe(12345), (4, EXACT, -250, 37))
+        self.table.store(54321, 2, UPPER_BOUND, 10)
+        self.assertEqual(self.table.probe(54321), (2, UPPER_BOUND, 10, None))
+        self.assertIsNone(self.table.probe(999))
+        self.assertEqual(self.table.hits, 2)
+        self.assertEqual(self.table.misses, 1)
+
+    def test_depth_preferred_and_always_replace(self):
+        buckets = self.table.buckets
+        deep, shallow, newest = 7, 7 + buckets, 7 + 2 * buckets
+        self.table.store(deep, 8, EXACT, 1)
+        self.table.store(shallow, 2, LOWER_BOUND, 2)
+        self.table.store(newest, 1, LOWER_BOUND, 3)
+        self.assertIsNotNone(self.table.probe(deep))
+        self.assertIsNone(self.table.probe(shallow))
+        self.assertIsNotNone(self.table.probe(newest))
+        self.assertEqual(self.table.collisions, 1)
+
+    def test_new_search_ages_depth_preferred_slot(self):
+        buckets = self.table.buckets
+        self.table.store(3, 8, EXACT, 1)
+        self.table.new_search()
+        self.table.store(3 + buckets, 1, EXACT, 2)
+        self.assertEqual(self.table.probe(3 + buckets), (1, EXACT, 2, None))
+        self.assertEqual(self.table.probe(3), (8, EXACT, 1, None))
+
+    def test_stats_and_clear(self):
+        self.table.store(1, 1, EXACT, 0)
+        self.table.probe(1)
+        stats = self.table.stats()
+        self.assertEqual(stats['used'], 1)
+        self.assertEqual(stats['hit_rate'], 1.0)
+        self.table.clear()
+        self.assertEqual(self.table.stats()['used'], 0)
+        self.assertIsNone(self.table.probe(1))
+
+    def test_search_with_table_visits_fewer_nodes(self):
+        plain = SearchEngine(max_depth=6).search(GameBoard())
+        table = TranspositionTable(memory_bytes=1 << 20)
+        cached = SearchEngine(max_depth=6, transposition_table=table).search(GameBoard())
+        self.assertEqual(cached.depth, 6)
+        self.assertLess(cached.nodes, plain.nodes)
+        self.assertGreater(table.hits, 0)
+
+    def test_worker_table_is_reused_until_the_size_changes(self):
+        table = worker_table(1024)
+        self.assertIs(worker_table(1024), table)
+        self.assertEqual(worker_table(2048).memory_bytes, 2048)
+        self.assertIsNone(worker_table(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
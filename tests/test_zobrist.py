@@ -0,0 +1,67 @@
+import unittest
+from game_board import GameBoard, Piece
+from zobrist import compute_hash
+
+
+def reference_hash(board):
+    return compute_hash(board.white, board.black, board.kings, board.turn)
+
+
+class TestZobrist(unittest.TestCase):
+    def setUp(self):
+        self.board = GameBoard()
+
+    def test_initial_hash(self):
+        self.assertEqual(self.board.hash, reference_hash(self.board))
+        self.assertNotEqual(self.board.hash, 0)
+
+    def test_move_piece_updates_hash(self):
+        self.board.move_piece([(2, 1), (3, 2)])
+        self.assertEqual(self.board.hash, reference_hash(self.board))
+        self.board.move_piece([(5, 4), (4, 3)])
+        self.board.move_piece([(3, 2), (5, 4)])
+        self.assertEqual(self.board.hash, reference_hash(self.board))
+
+    def test_failed_move_keeps_hash(self):
+        before = self.board.hash
+        self.assertFalse(self.board.move_piece([(2, 1), (4, 3)]))
+        self.assertEqual(self.board.hash, before)
+
+    def test_square_edits_update_hash(self):
+        self.board.squares[3][2].piece = Piece('black')
+        self.board.squares[3][2].piece.is_king = True
+        self.board.squares[2][1].piece = None
+        self.assertEqual(self.board.hash, reference_hash(self.board))
+
+    def test_promotion_and_side_to_move(self):
+        self.board.squares[7][0].piece = None
+        self.board.squares[6][1].piece = Piece('white')
+        self.board.move_piece([(6, 1), (7, 0)])
+        self.assertEqual(self.board.turn, 'black')
+        self.assertEqual(self.board.hash, reference_hash(self.board))
+
+    def test_make_unmake_restores_hash(self):
+        hashes = [self.board.hash]
+        for ply in range(40):
+            moves = self.board.generate_legal_moves(self.board.turn, mandatory_capture=True)
+            if not moves:
+                break
+            self.board.make_move(moves[ply * 7 % len(moves)])
+            self.assertEqual(self.board.hash, reference_hash(self.board))
+            hashes.append(self.board.hash)
+        while self.board._undo_stack:
+            hashes.pop()
+            self.board.unmake_move()
+            self.assertEqual(self.board.hash, hashes[-1])
+
+    def test_transposed_positions_share_hash(self):
+        other = GameBoard()
+        for moves in ([(2, 1), (3, 2)], [(5, 0), (4, 1)], [(2, 3), (3, 4)], [(5, 2), (4, 3)]):
+            self.board.move_piece(moves)
+        for moves in ([(2, 3), (3, 4)], [(5, 2), (4, 3)], [(2, 1), (3, 2)], [(5, 0), (4, 1)]):
+            other.move_piece(moves)
+        self.assertEqual(self.board.hash, other.hash)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+from array import array
+
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+# Each entry is one 64-bit key plus one 64-bit packed record:
+# bound (2 bits) | depth (8) | generation (6) | move (11) | score + offset (rest).
+ENTRY_BYTES = 16
+SLOTS_PER_BUCKET = 2
+_SCORE_OFFSET = 1 << 20
+_NO_MOVE = 0x7FF
+
+
+def move_key(move):
+    return move.source << 5 | move.target
+
+
+class TranspositionTable:
+    """Fixed-size hash table of search results keyed by ``GameBoard.hash``.
+
+    Every bucket holds a depth-preferred slot and an always-replace slot. The
+    table is sized to fit ``memory_bytes`` and never grows afterwards.
+    """
+
+    def __init__(self, memory_bytes=16 * 1024 * 1024):
+        buckets = max(1, memory_bytes // (ENTRY_BYTES * SLOTS_PER_BUCKET))
+        self.buckets = 1 << (buckets.bit_length() - 1)
+        self._mask = self.buckets - 1
+        self._keys = array('Q', bytes(8 * SLOTS_PER_BUCKET * self.buckets))
+        self._data = array('q', bytes(8 * SLOTS_PER_BUCKET * self.buckets))
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    @property
+    def capacity(self):
+        return SLOTS_PER_BUCKET * self.buckets
+
+    @property
+    def memory_bytes(self):
+        return self.capacity * ENTRY_BYTES
+
+    def new_search(self):
+        # Older entries lose their claim on the depth-preferred slots.
+        self.generation = (self.generation + 1) & 0x3F
+
+    def clear(self):
+        for i in range(self.capacity):
+            self._keys[i] = 0
+            self._data[i] = 0
+        self.generation = 0
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def probe(self, key):
+        """Return ``(depth, bound, score, move_key)`` or ``None``; ``move_key`` may be ``None``."""
+        slot = (key & self._mask) * SLOTS_PER_BUCKET
+        occupied = False
+        for i in (slot, slot + 1):
+            data = self._data[i]
+            if not data:
+                continue
+            if self._keys[i] == key:
+                self.hits += 1
+                move = data >> 16 & 0x7FF
+                return (data >> 2 & 0xFF, data & 0x3, (data >> 27) - _SCORE_OFFSET,
+                        None if move == _NO_MOVE else move)
+            occupied = True
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, bound, score, move=None):
+        slot = (key & self._mask) * SLOTS_PER_BUCKET
+        depth = max(0, min(depth, 0xFF))
+        data = (((score + _SCORE_OFFSET) << 27) | ((_NO_MOVE if move is None else move) << 16)
+                | (self.generation << 10) | (depth << 2) | bound)
+        existing = self._data[slot]
+        if (not existing or self._keys[slot] == key or depth >= (existing >> 2 & 0xFF)
+                or (existing >> 10 & 0x3F) != self.generation):
+            if existing and self._keys[slot] != key:
+                # Demote the old depth-preferred entry instead of losing it.
+                self._keys[slot + 1] = self._keys[slot]
+                self._data[slot + 1] = existing
+            self._keys[slot] = key
+            self._data[slot] = data
+        else:
+            self._keys[slot + 1] = key
+            self._data[slot + 1] = data
+        self.stores += 1
+
+    def stats(self):
+        used = sum(1 for data in self._data if data)
+        probes = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'collisions': self.collisions,
+            'stores': self.stores,
+            'hit_rate': self.hits / probes if probes else 0.0,
+            'used': used,
+            'capacity': self.capacity,
+            'memory_bytes': self.memory_bytes,
+        }
+
+
+_worker_table = None
+
+
+def worker_table(memory_bytes):
+    """Per-process table for pool workers, reused until the size changes; ``None`` for 0 bytes."""
+    global _worker_table
+    if not memory_bytes:
+        return None
+    if _worker_table is None or _worker_table[0] != memory_bytes:
+        _worker_table = (memory_bytes, TranspositionTable(memory_bytes))
+    return _worker_table[1]
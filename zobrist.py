@@ -0,0 +1,35 @@
+"""Zobrist keys for positions on the 32 playable squares.
+
+``GameBoard`` keeps ``hash`` up to date incrementally; ``compute_hash`` is the
+from-scratch reference used when a position is loaded wholesale.
+"""
+import random
+
+from bitboard import iter_bits
+
+_random = random.Random(0x5EED_C4EC)
+
+WHITE_MAN = [_random.getrandbits(64) for _ in range(32)]
+WHITE_KING = [_random.getrandbits(64) for _ in range(32)]
+BLACK_MAN = [_random.getrandbits(64) for _ in range(32)]
+BLACK_KING = [_random.getrandbits(64) for _ in range(32)]
+BLACK_TO_MOVE = _random.getrandbits(64)
+
+
+def piece_key(white, kings, index):
+    """Key of the piece standing on ``index``; ``white`` / ``kings`` are masks."""
+    if white >> index & 1:
+        return WHITE_KING[index] if kings >> index & 1 else WHITE_MAN[index]
+    return BLACK_KING[index] if kings >> index & 1 else BLACK_MAN[index]
+
+
+def mask_hash(white, kings, mask):
+    key = 0
+    for index in iter_bits(mask):
+        key ^= piece_key(white, kings, index)
+    return key
+
+
+def compute_hash(white, black, kings, turn='white'):
+    key = mask_hash(white, kings, white | black)
+    return key ^ BLACK_TO_MOVE if turn == 'black' else key